@@ -1,12 +1,10 @@
 # app/api/dependencies.py
-from fastapi import Header, HTTPException, Depends
-from typing import Optional
+from fastapi import HTTPException, Depends
 from loguru import logger
 
 from ..config.database import get_database, get_mongo_client
-from ..services.schema_service import schema_service
 from ..services.auth_validation_service import auth_validation_service
-from ..middleware.jwt import JWTAccount , get_current_user 
+from ..middleware.jwt import JWTAccount, get_current_user
 
 
 async def validate_user_access(
@@ -16,20 +14,17 @@ async def validate_user_access(
     Comprehensive validation dependency
     """
     try:
-        logger.info(f"Validating access for user={current_user.user_id}, tenant={current_user.tenant_id}")
+        # DEBUG level - runs on every authenticated request
+        logger.debug("Validating access for user={}, tenant={}", current_user.user_id, current_user.tenant_id)
         
-        # Validate user-tenant relationship
-        await auth_validation_service.validate_user_tenant_access(
+        # Single aggregation validates user, tenant, relationship, and
+        # content in one Mongo round-trip (granular checks only on failure)
+        await auth_validation_service.validate_all(
             current_user.user_id,
             current_user.tenant_id
         )
         
-        # Validate tenant has content
-        await auth_validation_service.validate_tenant_has_content(
-            current_user.tenant_id
-        )
-        
-        logger.info(f"Access validation passed for user={current_user.user_id}")
+        logger.debug("Access validation passed for user={}", current_user.user_id)
         return current_user
         
     except HTTPException:
@@ -1,33 +1,60 @@
 # app/api/routes/chat.py
-from fastapi import APIRouter, HTTPException, Depends
-from typing import Dict, Any
+import asyncio
+import hashlib
+from types import MappingProxyType
+
+import orjson
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
+from fastapi.responses import ORJSONResponse
+from sse_starlette.sse import EventSourceResponse
 from loguru import logger
 
 from ...models.chat import MessageRequest, APIResponse
 from ...utilities.helpers.data_formatters import format_api_response, format_error_response
 from ...services.chat_service import chat_service
-from ...core.schema_extractor import get_tenant_schema
+from ...core.schema_cache import get_cached_tenant_schema
 from ...config.setting import settings
 from ...middleware.jwt import get_current_user, JWTAccount
 from ...api.dependencies import validate_user_access  # NEW
 from ...middleware.validation import ValidationMiddleware  # NEW
 
-router = APIRouter()
+# orjson encoding roughly halves serialization CPU on large list/semantic payloads
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Operations that need the tenant schema attached to the response
+_SCHEMA_OPS = frozenset({"list", "semantic"})
+
+# Constant SSE frames - built once, yielded on every stream teardown
+_SSE_DONE = {"data": '{"type":"done"}'}
+_SSE_ERROR = {"data": '{"type":"error","message":"Internal server error"}'}
+
+# Static portion of the capabilities payload - built once at import so the
+# handler only splices in the per-user fields. Read-only view + tuples so
+# no handler can mutate the shared payload in place
+_BASE_CAPABILITIES = MappingProxyType({
+    "operations": ("list", "semantic", "distribution", "pure_advisory"),
+    "features": (
+        "natural_language_queries",
+        "conversation_context",
+        "content_analysis",
+        "tenant_isolation"
+    ),
+    "max_message_length": settings.MAX_QUERY_LENGTH,
+    "supported_languages": ("en",)
+})
 
 
 @router.post("/ai-chat", response_model=APIResponse)
 async def send_message(
-    request: MessageRequest, 
-    current_user: JWTAccount = Depends(get_current_user),
-    validated_user: JWTAccount = Depends(validate_user_access)  
+    request: MessageRequest,
+    validated_user: JWTAccount = Depends(validate_user_access)
 ):
     """
     Process chat message with comprehensive validation
     """
     try:
-        # Validate and sanitize message
-        ValidationMiddleware.validate_message(request.message)
-        request.message = ValidationMiddleware.sanitize_message(request.message)
+        # Validate and sanitize message (single pass)
+        request.message = ValidationMiddleware.sanitize_and_validate(request.message)
         
         # Validate session_id format
         # ValidationMiddleware.validate_session_id(request.session_id)
@@ -40,7 +67,7 @@ async def send_message(
         if not session_id:
             from ...services.session_service import session_service
             session_id = await session_service.create_session(tenant_id)
-            logger.info(f"Auto-created session {session_id}")
+            logger.info("Auto-created session {}", session_id)
         
         # Process chat message
         internal_response = await chat_service.process_chat_message(
@@ -51,34 +78,126 @@ async def send_message(
         
         # Get tenant schema
         tenant_schema = None
-        if internal_response.operation in ['list', 'semantic']:
-            try:
-                tenant_schema = get_tenant_schema(
-                    settings.MONGODB_URI, 
-                    settings.DATABASE_NAME, 
-                    tenant_id
-                )
-            except Exception as e:
-                logger.warning(f"Failed to get tenant schema: {e}")
+        if internal_response.operation in _SCHEMA_OPS:
+            tenant_schema = await get_cached_tenant_schema(tenant_id)
         
         # Format response
-        api_response = format_api_response(
+        # session_id is embedded during construction - no post-hoc dict merge.
+        # Formatting walks every content item, so large list/semantic payloads
+        # run off the event loop
+        api_response = await asyncio.to_thread(
+            format_api_response,
             internal_response,
             tenant_schema=tenant_schema,
-            tenant_id=tenant_id
+            tenant_id=tenant_id,
+            session_id=session_id
         )
-        
-        # Include session_id
-        if "data" in api_response:
-            api_response["data"]["session_id"] = session_id
-        else:
-            api_response["data"] = {"session_id": session_id}
-        
-        logger.info(f"Chat processed: tenant={tenant_id}, user={validated_user.user_id}, session={session_id}")
-        return api_response
+
+        # Deferred formatting - loguru only interpolates if INFO is emitted
+        logger.info("Chat processed: tenant={}, user={}, session={}",
+                    tenant_id, validated_user.user_id, session_id)
+        # Return the dict directly so the router's ORJSONResponse encodes it
+        # without an extra jsonable_encoder pass over large payloads
+        return ORJSONResponse(content=api_response)
         
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Chat endpoint error: {e}")
-        return format_error_response("Internal server error", "internal_error")
\ No newline at end of file
+        return format_error_response("Internal server error", "internal_error")
+
+
+@router.post("/ai-chat/stream")
+async def send_message_streaming(
+    request: MessageRequest,
+    validated_user: JWTAccount = Depends(validate_user_access)
+):
+    """
+    Process chat message over SSE - emits status, result, and done events
+    """
+    # Validate and sanitize message (single pass)
+    request.message = ValidationMiddleware.sanitize_and_validate(request.message)
+
+    tenant_id = validated_user.tenant_id
+
+    # Handle session_id
+    session_id = request.session_id
+    if not session_id:
+        from ...services.session_service import session_service
+        session_id = await session_service.create_session(tenant_id)
+        logger.info("Auto-created session {}", session_id)
+
+    async def generate_stream():
+        try:
+            # EventSourceResponse owns the SSE framing - we just yield data
+            yield {"data": orjson.dumps({
+                "type": "status",
+                "message": "processing",
+                "session_id": session_id
+            }).decode()}
+
+            # Tokens are relayed as the LLM generates them - time-to-first-
+            # token instead of full generation time. The final event carries
+            # the complete response for the usual formatting pass.
+            internal_response = None
+            async for event in chat_service.process_chat_message_stream(
+                message=request.message,
+                tenant_id=tenant_id,
+                session_id=session_id
+            ):
+                if event["type"] == "token":
+                    yield {"data": orjson.dumps(event).decode()}
+                else:  # final
+                    internal_response = event["response"]
+
+            tenant_schema = None
+            if internal_response.operation in _SCHEMA_OPS:
+                tenant_schema = await get_cached_tenant_schema(tenant_id)
+
+            api_response = await asyncio.to_thread(
+                format_api_response,
+                internal_response,
+                tenant_schema=tenant_schema,
+                tenant_id=tenant_id,
+                session_id=session_id
+            )
+
+            yield {"data": orjson.dumps({"type": "result", **api_response}).decode()}
+            yield _SSE_DONE
+
+        except Exception as e:
+            logger.error(f"Chat stream error: {e}")
+            yield _SSE_ERROR
+
+    # ping=15 keeps proxies (nginx/cloudflare) from closing idle streams
+    return EventSourceResponse(generate_stream(), ping=15)
+
+
+@router.get("/capabilities")
+async def get_capabilities(
+    request: Request,
+    current_user: JWTAccount = Depends(get_current_user)
+):
+    """
+    Get chat capabilities for the current tenant
+    """
+    body = orjson.dumps({
+        "success": True,
+        "message": "Chat capabilities",
+        "data": {
+            **_BASE_CAPABILITIES,
+            "tenant_id": current_user.tenant_id,
+            "user_id": current_user.user_id
+        }
+    })
+
+    # Per-tenant-static payload - let polling dashboards short-circuit
+    etag = f'"{hashlib.blake2s(body).hexdigest()[:16]}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": "private, max-age=60"}
+    )
\ No newline at end of file
@@ -3,12 +3,20 @@ Webhook endpoints for Node.js server to sync embeddings
 Called after sitemap CRUD operations
 """
 
+import asyncio
+import hashlib
+import threading
+
 from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional, Tuple
+from bson import ObjectId
 from loguru import logger
 
+from ...config.database import db_connection
 from ...services.vector_service import vector_service
+from ...services.schema_service import schema_service
+from ...core.schema_cache import invalidate_tenant_schema
 from ...utilities.embeddings import embedding_generator
 from ...middleware.jwt import get_current_user, JWTAccount
 from ...config.setting import settings
@@ -16,16 +24,49 @@ from ...models.sitemapsSync import SitemapSyncRequest
 
 router = APIRouter()
 
-@router.post("/sitemap/embed", response_model=dict)
-def sync_sitemap_embedding(
+# Singleflight guard: identical (tenant, sitemap, text) syncs queued while one
+# is already in flight would call OpenAI twice for the same result. Node.js
+# retries and concurrent editors make this a real (paid) duplicate.
+_inflight_embeds: set = set()
+_inflight_lock = threading.Lock()
+
+
+def _embed_key(data: SitemapSyncRequest, text: str) -> str:
+    digest = hashlib.blake2s(text.encode()).hexdigest()[:16]
+    return f"{data.tenant_id}:{data.sitemap_id}:{digest}"
+
+
+def _do_embed(data: SitemapSyncRequest, text: str, key: str):
+    """Generate + store one embedding (runs as a background task)"""
+    try:
+        embedding = embedding_generator.generate_embedding(text)
+        success = vector_service.store_embedding(
+            sitemap_id=data.sitemap_id,
+            tenant_id=data.tenant_id,
+            embedding=embedding
+        )
+        if success:
+            logger.info("✅ Synced embedding for {}", data.sitemap_id)
+        else:
+            logger.error(f"Failed to store embedding for {data.sitemap_id}")
+    except Exception as e:
+        logger.error(f"Background embedding sync error for {data.sitemap_id}: {e}")
+    finally:
+        with _inflight_lock:
+            _inflight_embeds.discard(key)
+
+
+@router.post("/sitemap/embed", response_model=dict, status_code=202)
+async def sync_sitemap_embedding(
     data: SitemapSyncRequest,
     background_tasks: BackgroundTasks,
     current_user: JWTAccount = Depends(get_current_user)
 ):
     """
     Sync embedding after sitemap create/update
-    Runs in background to avoid blocking Node.js
-    
+    Queues the OpenAI + pgvector work and returns immediately so the
+    Node.js caller never waits on the embedding round-trip
+
     Call this from Node.js after sitemap insert/update:
     POST /api/v1/sync/sitemap/embed
     """
@@ -33,13 +74,16 @@ def sync_sitemap_embedding(
         # Verify tenant access
         if current_user.tenant_id != data.tenant_id:
             raise HTTPException(403, "Tenant access denied")
-        
+
+        # Sitemap changed - cached schema for this tenant is stale
+        invalidate_tenant_schema(data.tenant_id)
+
         if not settings.VECTOR_SEARCH_ENABLED:
             return {
                 "success": True,
                 "message": "Vector search disabled, skipping embedding"
             }
-        
+
         # Combine text fields
         text = embedding_generator.combine_fields(
             name=data.name,
@@ -48,33 +92,34 @@ def sync_sitemap_embedding(
             readerBenefit=data.readerBenefit,
             explanation=data.explanation
         )
-        
+
         if not text.strip():
             logger.warning(f"Empty text for sitemap {data.sitemap_id}")
             return {
                 "success": False,
                 "message": "No text content to embed"
             }
-        
-        # Generate and store embedding synchronously (fast enough)
-        embedding = embedding_generator.generate_embedding(text)
-        success = vector_service.store_embedding(
-            sitemap_id=data.sitemap_id,
-            tenant_id=data.tenant_id,
-            embedding=embedding
-        )
-        
-        if success:
-            logger.info(f"✅ Synced embedding for {data.sitemap_id}")
-            return {
-                "success": True,
-                "sitemap_id": data.sitemap_id,
-                "tenant_id": data.tenant_id,
-                "embedding_dimensions": len(embedding)
-            }
+
+        # Queue the blocking work - caller gets a 202 in milliseconds.
+        # Identical in-flight syncs coalesce into the already-queued call
+        key = _embed_key(data, text)
+        with _inflight_lock:
+            already_queued = key in _inflight_embeds
+            if not already_queued:
+                _inflight_embeds.add(key)
+
+        if already_queued:
+            logger.debug("Coalesced duplicate embedding sync for {}", data.sitemap_id)
         else:
-            raise HTTPException(500, "Failed to store embedding")
-        
+            background_tasks.add_task(_do_embed, data, text, key)
+
+        return {
+            "success": True,
+            "status": "queued",
+            "sitemap_id": data.sitemap_id,
+            "tenant_id": data.tenant_id
+        }
+
     except HTTPException:
         raise
     except Exception as e:
@@ -94,6 +139,9 @@ def delete_sitemap_embedding(
     DELETE /api/v1/sync/sitemap/{sitemap_id}/embed
     """
     try:
+        # Sitemap removed - cached schema for this tenant is stale
+        invalidate_tenant_schema(current_user.tenant_id)
+
         if not settings.VECTOR_SEARCH_ENABLED:
             return {"success": True, "message": "Vector search disabled"}
         
@@ -118,6 +166,29 @@ def delete_sitemap_embedding(
         raise HTTPException(500, str(e))
 
 
+@router.post("/schema/invalidate")
+async def invalidate_schema(
+    current_user: JWTAccount = Depends(get_current_user)
+):
+    """
+    Manually invalidate cached tenant schema
+
+    Call from Node.js after category/topic/content-type changes that
+    don't go through the sitemap embed webhooks
+    """
+    try:
+        invalidate_tenant_schema(current_user.tenant_id)
+        await schema_service.clear_cache(current_user.tenant_id)
+
+        return {
+            "success": True,
+            "message": f"Schema cache invalidated for tenant {current_user.tenant_id}"
+        }
+    except Exception as e:
+        logger.error(f"Schema invalidation error: {e}")
+        raise HTTPException(500, str(e))
+
+
 @router.get("/tenant/embeddings/stats")
 def get_tenant_embedding_stats(
     current_user: JWTAccount = Depends(get_current_user)
@@ -134,64 +205,112 @@ def get_tenant_embedding_stats(
         raise HTTPException(500, str(e))
 
 
+_BACKFILL_BATCH_SIZE = 128  # OpenAI accepts up to 2048 inputs per request
+_BACKFILL_CONCURRENCY = 16  # In-flight embedding batches while IO-bound
+
+# Strong references to running backfill tasks so the event loop doesn't
+# garbage-collect them mid-run (same pattern as chat_service._storage_tasks)
+_backfill_tasks: set = set()
+
+
+def _collect_backfill_items(tenant_id: str) -> List[Tuple[str, str]]:
+    """Read all sitemap texts for a tenant (blocking - run in a thread)"""
+    db = db_connection.get_database()
+    items = []
+
+    # Project only the embedded fields and pull 500 docs per GETMORE so a
+    # large-tenant backfill doesn't ship whole documents in 101-doc batches
+    cursor = db.sitemaps.find(
+        {"tenant": ObjectId(tenant_id)},
+        projection={
+            "_id": 1,
+            "name": 1,
+            "description": 1,
+            "summary": 1,
+            "readerBenefit": 1,
+            "explanation": 1
+        }
+    ).batch_size(500)
+
+    for sitemap in cursor:
+        text = embedding_generator.combine_fields(
+            name=sitemap.get("name"),
+            description=sitemap.get("description"),
+            summary=sitemap.get("summary"),
+            reader_benefit=sitemap.get("readerBenefit"),
+            explanation=sitemap.get("explanation")
+        )
+
+        if text.strip():
+            items.append((str(sitemap["_id"]), text))
+
+    return items
+
+
+def _embed_and_store_batch(tenant_id: str, batch: List[Tuple[str, str]]) -> int:
+    """Embed + upsert one batch in two bulk calls (blocking - run in a thread)"""
+    texts = [text for _, text in batch]
+    embeddings = embedding_generator.generate_embeddings_batch(texts)
+    rows = [
+        (sitemap_id, tenant_id, embedding)
+        for (sitemap_id, _), embedding in zip(batch, embeddings)
+    ]
+    return vector_service.store_embeddings_batch(rows)
+
+
+async def _backfill_task(tenant_id: str):
+    """Backfill all embeddings for a tenant with bounded concurrency"""
+    try:
+        items = await asyncio.to_thread(_collect_backfill_items, tenant_id)
+
+        batches = [
+            items[i:i + _BACKFILL_BATCH_SIZE]
+            for i in range(0, len(items), _BACKFILL_BATCH_SIZE)
+        ]
+
+        sem = asyncio.Semaphore(_BACKFILL_CONCURRENCY)
+
+        async def process(batch):
+            async with sem:
+                return await asyncio.to_thread(_embed_and_store_batch, tenant_id, batch)
+
+        results = await asyncio.gather(
+            *(process(batch) for batch in batches),
+            return_exceptions=True
+        )
+
+        count = sum(r for r in results if isinstance(r, int))
+        errors = len(items) - count
+        for r in results:
+            if isinstance(r, Exception):
+                logger.error(f"Backfill batch error for tenant {tenant_id}: {r}")
+
+        logger.info(f"✅ Backfill complete: {count} success, {errors} errors")
+
+    except Exception as e:
+        logger.error(f"Backfill failed for tenant {tenant_id}: {e}")
+
+
 @router.post("/tenant/embeddings/backfill")
-def backfill_tenant_embeddings(
-    background_tasks: BackgroundTasks,
+async def backfill_tenant_embeddings(
     current_user: JWTAccount = Depends(get_current_user)
 ):
     """
     Backfill embeddings for all existing sitemaps
-    Admin endpoint - runs in background
+    Admin endpoint - runs on the event loop with bounded concurrency
     """
     try:
-        from ...config.database import db_connection
-        from bson import ObjectId
-        
-        def backfill_task(tenant_id: str):
-            """Background task for backfilling"""
-            db = db_connection.get_database()
-            tenant_obj_id = ObjectId(tenant_id)
-            
-            sitemaps = db.sitemaps.find({"tenant": tenant_obj_id})
-            count = 0
-            errors = 0
-            
-            for sitemap in sitemaps:
-                try:
-                    text = embedding_generator.combine_fields(
-                        name=sitemap.get("name"),
-                        description=sitemap.get("description"),
-                        summary=sitemap.get("summary"),
-                        reader_benefit=sitemap.get("readerBenefit"),
-                        explanation=sitemap.get("explanation")
-                    )
-                    
-                    if text.strip():
-                        embedding = embedding_generator.generate_embedding(text)
-                        vector_service.store_embedding(
-                            sitemap_id=str(sitemap["_id"]),
-                            tenant_id=tenant_id,
-                            embedding=embedding
-                        )
-                        count += 1
-                        
-                        if count % 100 == 0:
-                            logger.info(f"Backfilled {count} embeddings for tenant {tenant_id}")
-                            
-                except Exception as e:
-                    logger.error(f"Backfill error for {sitemap['_id']}: {e}")
-                    errors += 1
-            
-            logger.info(f"✅ Backfill complete: {count} success, {errors} errors")
-        
-        # Run in background
-        background_tasks.add_task(backfill_task, current_user.tenant_id)
-        
+        # Event-loop task (not BackgroundTasks/threadpool) so batches can
+        # overlap their OpenAI round-trips under the semaphore
+        task = asyncio.create_task(_backfill_task(current_user.tenant_id))
+        _backfill_tasks.add(task)
+        task.add_done_callback(_backfill_tasks.discard)
+
         return {
             "success": True,
             "message": "Backfill started in background"
         }
-        
+
     except Exception as e:
         logger.error(f"Backfill initialization error: {e}")
         raise HTTPException(500, str(e))
\ No newline at end of file
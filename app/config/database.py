@@ -2,20 +2,31 @@
 from pymongo import MongoClient
 from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
 import psycopg2
-from psycopg2.pool import SimpleConnectionPool
+from psycopg2.pool import ThreadedConnectionPool
 from psycopg2.extras import execute_values
+from contextlib import contextmanager
 import logging
+import threading
+import time
 from loguru import logger
 
 from .setting import settings
 
 class DatabaseConnection:
     """MongoDB connection manager"""
-    
+
+    _connect_lock = threading.Lock()
+
     def __init__(self):
         self._client = None
         self._db = None
-    
+        self._last_check_ts = 0.0
+        self._last_check_ok = False
+        self._check_lock = threading.Lock()
+        self._healthy = True
+        self._last_success = 0.0
+        self._probe_started = False
+
     def connect(self):
         """Establish database connection"""
         try:
@@ -23,13 +34,31 @@ class DatabaseConnection:
                 settings.MONGODB_URI,
                 serverSelectionTimeoutMS=5000,
                 connectTimeoutMS=5000,
-                maxPoolSize=50,
-                minPoolSize=5
+                maxPoolSize=settings.MONGO_MAX_POOL_SIZE,
+                minPoolSize=settings.MONGO_MIN_POOL_SIZE,
+                maxIdleTimeMS=settings.MONGO_MAX_IDLE_MS,
+                waitQueueTimeoutMS=settings.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+                appname=settings.TITLE,
+                # Wire compression - large content documents shrink 3-5x on
+                # the socket; pymongo falls back through the list to whatever
+                # the server and installed libs both support
+                compressors="zstd,snappy,zlib",
+                zlibCompressionLevel=6,
+                retryReads=True,
+                retryWrites=True,
+                # Explicit fast-path BSON decode options - naive datetimes
+                # (no per-doc tzinfo allocation) and standard UUID handling
+                tz_aware=False,
+                uuidRepresentation="standard",
+                document_class=dict
             )
             
             self._client.admin.command('ping')
             self._db = self._client[settings.DATABASE_NAME]
-            
+            self._healthy = True
+            self._last_success = time.monotonic()
+            self._start_probe()
+
             logger.info(f"Connected to MongoDB: {settings.DATABASE_NAME}")
             return True
             
@@ -40,47 +69,134 @@ class DatabaseConnection:
             logger.error(f"Unexpected database error: {e}")
             return False
     
+    def _start_probe(self):
+        """Start the background liveness probe (once)"""
+        if self._probe_started:
+            return
+        self._probe_started = True
+        thread = threading.Thread(target=self._probe_loop, daemon=True,
+                                  name="mongo-health-probe")
+        thread.start()
+
+    def _probe_loop(self):
+        """Ping MongoDB periodically so failures are detected proactively"""
+        while True:
+            time.sleep(settings.HEALTH_PROBE_INTERVAL)
+            if self._client is None:
+                continue
+            try:
+                self._client.admin.command('ping')
+                if not self._healthy:
+                    logger.info("MongoDB probe: connection recovered")
+                self._healthy = True
+                self._last_success = time.monotonic()
+            except Exception as e:
+                if self._healthy:
+                    logger.error(f"MongoDB probe failed: {e}")
+                self._healthy = False
+
+    def _check_breaker(self):
+        """Fail fast when Mongo has been down past the breaker window
+
+        Without this, every request blocks the full 5s server-selection
+        timeout while Mongo is unreachable.
+        """
+        if self._healthy:
+            return
+        if time.monotonic() - self._last_success > 2 * settings.HEALTH_PROBE_INTERVAL:
+            raise ConnectionFailure("MongoDB unavailable (circuit open)")
+
     def disconnect(self):
         """Close database connection"""
-        if self._client is not None:  
+        if self._client is not None:
             self._client.close()
             logger.info("Disconnected from MongoDB")
-    
+
     def get_client(self):
-        """Get MongoDB client"""
-        if self._client is None: 
-            self.connect()
+        """Get MongoDB client (lazy connect, double-checked lock)"""
+        if self._client is None:
+            with self._connect_lock:
+                if self._client is None:
+                    self.connect()
+        self._check_breaker()
         return self._client
-    
+
     def get_database(self):
-        """Get database instance"""
-        if self._db is None:  
-            self.connect()
+        """Get database instance (lazy connect, double-checked lock)"""
+        if self._db is None:
+            with self._connect_lock:
+                if self._db is None:
+                    self.connect()
+        self._check_breaker()
         return self._db
     
     def health_check(self) -> bool:
-        """Check database health"""
-        try:
-            if self._client is None:  
-                return False
-            self._client.admin.command('ping')
-            return True
-        except Exception:
+        """Check database health (ping result cached briefly)"""
+        if self._client is None:
             return False
 
+        if time.monotonic() - self._last_check_ts < settings.HEALTH_CHECK_TTL_SECONDS:
+            return self._last_check_ok
+
+        with self._check_lock:
+            # A concurrent probe may have refreshed while we waited
+            if time.monotonic() - self._last_check_ts < settings.HEALTH_CHECK_TTL_SECONDS:
+                return self._last_check_ok
+            try:
+                self._client.admin.command('ping')
+                self._last_check_ok = True
+            except Exception:
+                self._last_check_ok = False
+            self._last_check_ts = time.monotonic()
+            return self._last_check_ok
+
+
+class TunedConnectionPool(ThreadedConnectionPool):
+    """Connection pool whose connections come pre-tuned for vector queries
+
+    Each new connection is initialized once at checkout-creation time, so
+    per-request SET round-trips and JIT compilation stalls on short pgvector
+    queries never happen.
+    """
+
+    _INIT_SQL = (
+        "SET application_name = 'demand-genius-api'; "
+        "SET jit = off; "
+        "SET statement_timeout = '10s'; "
+        "SET ivfflat.probes = 10"
+    )
+
+    def _connect(self, key=None):
+        conn = super()._connect(key)
+        try:
+            with conn.cursor() as cur:
+                cur.execute(self._INIT_SQL)
+            conn.commit()
+        except Exception as e:
+            logger.warning(f"Connection init tuning failed: {e}")
+            conn.rollback()
+        return conn
+
 
 class VectorDatabaseConnection:
     """PostgreSQL + pgvector connection manager"""
-    
+
+    _connect_lock = threading.Lock()
+
     def __init__(self):
         self._pool = None
-    
+        self._last_check_ts = 0.0
+        self._last_check_ok = False
+        self._check_lock = threading.Lock()
+
     def connect(self):
         """Establish connection pool"""
         try:
-            self._pool = SimpleConnectionPool(
-                minconn=2,
-                maxconn=10,
+            # ThreadedConnectionPool - SimpleConnectionPool is not safe under
+            # the threaded workers that run vector queries concurrently
+            self._pool = TunedConnectionPool(
+                minconn=settings.PG_MIN_CONN,
+                maxconn=settings.PG_MAX_CONN,
                 host=settings.POSTGRES_HOST,
                 port=settings.POSTGRES_PORT,
                 database=settings.POSTGRES_DB,
@@ -112,31 +228,71 @@ class VectorDatabaseConnection:
             logger.info("Disconnected from PostgreSQL")
     
     def get_connection(self):
-        """Get connection from pool"""
+        """Get connection from pool (lazy connect, double-checked lock)"""
         if self._pool is None:
-            self.connect()
+            with self._connect_lock:
+                if self._pool is None:
+                    self.connect()
         return self._pool.getconn()
     
     def return_connection(self, conn):
         """Return connection to pool"""
         if self._pool is not None:
             self._pool.putconn(conn)
-    
-    def health_check(self) -> bool:
-        """Check database health"""
+
+    @contextmanager
+    def connection(self):
+        """Checked-out connection that is always returned, even on error"""
+        conn = self.get_connection()
         try:
-            if self._pool is None:
-                return False
-            conn = self._pool.getconn()
+            yield conn
+        finally:
+            self.return_connection(conn)
+
+    def bulk_upsert(self, sql: str, rows: list, template: str = None,
+                    page_size: int = 1000) -> int:
+        """Run one execute_values batch write over a pooled connection
+
+        Collapses N single-row INSERT round-trips into ceil(N/page_size)
+        statements. Commits on success, rolls back and re-raises on error.
+        """
+        if not rows:
+            return 0
+        with self.connection() as conn:
             try:
                 with conn.cursor() as cur:
-                    cur.execute("SELECT 1")
-                return True
-            finally:
-                self._pool.putconn(conn)
-        except Exception:
+                    execute_values(cur, sql, rows, template=template,
+                                   page_size=page_size)
+                conn.commit()
+                return len(rows)
+            except Exception:
+                conn.rollback()
+                raise
+
+    def health_check(self) -> bool:
+        """Check database health (SELECT 1 result cached briefly)"""
+        if self._pool is None:
             return False
 
+        if time.monotonic() - self._last_check_ts < settings.HEALTH_CHECK_TTL_SECONDS:
+            return self._last_check_ok
+
+        with self._check_lock:
+            if time.monotonic() - self._last_check_ts < settings.HEALTH_CHECK_TTL_SECONDS:
+                return self._last_check_ok
+            try:
+                conn = self._pool.getconn()
+                try:
+                    with conn.cursor() as cur:
+                        cur.execute("SELECT 1")
+                    self._last_check_ok = True
+                finally:
+                    self._pool.putconn(conn)
+            except Exception:
+                self._last_check_ok = False
+            self._last_check_ts = time.monotonic()
+            return self._last_check_ok
+
 
 # Global connections
 db_connection = DatabaseConnection()
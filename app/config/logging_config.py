@@ -8,54 +8,70 @@ from loguru import logger
 import sys
 from pathlib import Path
 
+# Idempotency state - calling any setup entry point twice (FastAPI startup
+# plus a test fixture, say) must not stack duplicate sinks that multiply
+# every write
+_configured_env = None
+_handler_ids: list = []
+_logs_dir_created = False
+
+
+def _ensure_log_dir():
+    """Create the logs directory once per process (skips repeat syscalls)"""
+    global _logs_dir_created
+    if not _logs_dir_created:
+        Path("logs").mkdir(exist_ok=True)
+        _logs_dir_created = True
+
+
+def _remove_our_handlers():
+    """Remove only the sinks this module added"""
+    global _handler_ids
+    for handler_id in _handler_ids:
+        try:
+            logger.remove(handler_id)
+        except ValueError:
+            pass
+    _handler_ids = []
+
+
 def setup_logging():
     """
     Configure loguru for file and console logging
     """
-    # Create logs directory if it doesn't exist
-    log_dir = Path("logs")
-    log_dir.mkdir(exist_ok=True)
-    
+    global _configured_env, _handler_ids
+    if _configured_env == "default":
+        return logger
+
+    _ensure_log_dir()
+
     # Remove default handler
     logger.remove()
-    
+    _remove_our_handlers()
+
     # Console handler with color formatting
-    logger.add(
+    _handler_ids.append(logger.add(
         sys.stderr,
         format="<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
         level="INFO"
-    )
-    
-    # File handler - Daily rotation
-    logger.add(
-        "logs/advisory_system_{time:YYYY-MM-DD}.log",
-        format="{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {name}:{function}:{line} - {message}",
-        rotation="1 day",
+    ))
+
+    # Single structured file sink. The previous advisory/errors/query-parsing
+    # trio formatted and wrote every matching record up to three times;
+    # serialize=True emits one JSON line per record with no format-string
+    # interpolation, and consumers filter by level/name offline (jq, Loki).
+    # enqueue=True moves writes to a background thread so request threads
+    # never block on disk.
+    _handler_ids.append(logger.add(
+        "logs/app_{time:YYYY-MM-DD}.jsonl",
+        serialize=True,
+        rotation="200 MB",
         retention="30 days",
         level="DEBUG",
-        compression="zip"  # Compress old logs to save space
-    )
-    
-    # Error-specific log file
-    logger.add(
-        "logs/errors_{time:YYYY-MM-DD}.log",
-        format="{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {name}:{function}:{line} - {message}",
-        level="ERROR",
-        rotation="1 day",
-        retention="60 days",  # Keep errors longer
-        compression="zip"
-    )
-    
-    # Query parsing specific logs (for debugging)
-    logger.add(
-        "logs/query_parsing_{time:YYYY-MM-DD}.log",
-        format="{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {name}:{function}:{line} - {message}",
-        filter=lambda record: "query_parser" in record["name"] or "advisory" in record["name"],
-        rotation="1 day",
-        retention="14 days",
-        level="DEBUG"
-    )
-    
+        enqueue=True
+    ))
+
+    _configured_env = "default"
     logger.info("Logging system initialized successfully")
     return logger
 
@@ -114,79 +130,104 @@ def setup_environment_logging(env: str = "development"):
         "testing": LoggingConfig.TESTING
     }
     
+    global _configured_env
+    if _configured_env == env.lower():
+        return
+
     config = config_map.get(env.lower(), LoggingConfig.DEVELOPMENT)
-    
-    # Create logs directory
-    log_dir = Path("logs")
-    log_dir.mkdir(exist_ok=True)
-    
+
+    _ensure_log_dir()
+
     # Remove default handler
     logger.remove()
-    
+    _remove_our_handlers()
+
     # Console handler
-    logger.add(
+    _handler_ids.append(logger.add(
         sys.stderr,
         format="<green>{time:HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan> - <level>{message}</level>",
         level=config["console_level"]
-    )
-    
+    ))
+
     # Main application log
-    logger.add(
+    _handler_ids.append(logger.add(
         f"logs/app_{env}_{'{time:YYYY-MM-DD}'}.log",
         format="{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {name}:{function}:{line} - {message}",
         rotation="1 day",
         retention=f"{config['retention_days']} days",
         level=config["file_level"],
-        compression="zip"
-    )
-    
+        enqueue=True
+    ))
+
     # Query-specific logs (if enabled)
+    # Route records via logger.bind(category="query") - an O(1) dict lookup
+    # per record instead of lowercasing and scanning every message
     if config["enable_query_logs"]:
-        logger.add(
+        _handler_ids.append(logger.add(
             f"logs/queries_{env}_{'{time:YYYY-MM-DD}'}.log",
             format="{time:YYYY-MM-DD HH:mm:ss.SSS} | {message}",
-            filter=lambda record: any(keyword in record["message"].lower() 
-                                    for keyword in ["query", "semantic", "distribution", "advisory"]),
+            filter=lambda record: record["extra"].get("category") == "query",
             rotation="1 day",
-            retention="7 days"
-        )
-    
+            retention="7 days",
+            enqueue=True
+        ))
+
+    _configured_env = env.lower()
     logger.info(f"Logging configured for {env} environment")
 
 
 # Utility functions for specific logging needs
+# Arguments are passed positionally so loguru only formats them when a sink
+# actually accepts the record; category="query" routes them to the query sink
 def log_query_performance(query: str, operation: str, duration: float, results_count: int):
     """Log query performance metrics"""
-    logger.info(f"PERFORMANCE | Query: '{query[:50]}...' | Operation: {operation} | Duration: {duration:.3f}s | Results: {results_count}")
+    logger.bind(category="query").info(
+        "PERFORMANCE | Query: '{}...' | Operation: {} | Duration: {:.3f}s | Results: {}",
+        query[:50], operation, duration, results_count
+    )
 
 
 def log_api_call(service: str, tokens_in: int, tokens_out: int, cost: float):
     """Log API usage for monitoring"""
-    logger.info(f"API_USAGE | Service: {service} | Tokens: {tokens_in}→{tokens_out} | Cost: ${cost:.4f}")
+    logger.info("API_USAGE | Service: {} | Tokens: {}→{} | Cost: ${:.4f}",
+                service, tokens_in, tokens_out, cost)
 
 
 def log_user_interaction(tenant_id: str, query: str, operation: str, confidence: str):
     """Log user interactions for analytics"""
-    logger.info(f"USER_INTERACTION | Tenant: {tenant_id} | Query: '{query[:30]}...' | Op: {operation} | Confidence: {confidence}")
+    logger.bind(category="query").info(
+        "USER_INTERACTION | Tenant: {} | Query: '{}...' | Op: {} | Confidence: {}",
+        tenant_id, query[:30], operation, confidence
+    )
 
 
 # Example integration with existing services
 class LoggerMixin:
     """Mixin to add consistent logging to service classes"""
-    
-    def __init__(self):
-        self.logger = get_logger(self.__class__.__name__)
-    
+
+    # No per-instance state: the bound logger lives on the class, created
+    # once per subclass instead of one bind() dict copy per instance
+    __slots__ = ()
+
+    logger = logger
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.logger = get_logger(cls.__name__)
+
     def log_service_start(self, method_name: str, **kwargs):
         """Log service method start"""
-        self.logger.debug(f"Starting {method_name} with args: {kwargs}")
-    
+        # The kwargs repr is only built if DEBUG actually emits
+        self.logger.opt(lazy=True).debug("Starting {} with args: {}",
+                                         lambda: method_name, lambda: repr(kwargs))
+
     def log_service_success(self, method_name: str, result_preview: str = None):
         """Log service method success"""
         if result_preview:
-            self.logger.info(f"{method_name} completed successfully. Preview: {result_preview}")
+            self.logger.info("{} completed successfully. Preview: {}",
+                             method_name, result_preview)
         else:
-            self.logger.info(f"{method_name} completed successfully")
+            self.logger.info("{} completed successfully", method_name)
     
     def log_service_error(self, method_name: str, error: Exception):
         """Log service method error"""
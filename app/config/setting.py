@@ -4,6 +4,8 @@ New settings manager - Backward compatible with your existing code
 NO CHANGES needed in other files that import from here
 """
 import os
+from functools import lru_cache
+
 from decouple import config
 from app.config.settings.base import BackendBaseSettings
 from app.config.settings.development import BackendDevSettings
@@ -13,9 +15,13 @@ from app.config.settings.production import BackendProdSettings
 # Determine environment from .env file
 ENV = config("ENVIRONMENT", default="DEV")
 
+@lru_cache(maxsize=1)
 def get_settings() -> BackendBaseSettings:
     """
     Factory function to return appropriate settings based on environment
+
+    Cached so every caller shares one instance - each construction
+    re-parses .env and re-runs pydantic validation
     """
     env_map = {
         "DEV": BackendDevSettings,
@@ -41,6 +47,9 @@ def validate_settings():
     
     if not settings.OPENAI_API_KEY:
         errors.append("OPENAI_API_KEY must be set")
+
+    if not settings.JWT_SECRET_KEY:
+        errors.append("JWT_SECRET_KEY must be set")
     
     if not settings.MONGODB_URI:
         errors.append("MONGODB_URI must be set")
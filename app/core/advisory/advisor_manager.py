@@ -4,17 +4,51 @@ Simple Advisory Orchestrator - Direct routing without LangChain overhead
 Single API call orchestration using existing agents and context manager
 """
 
+import asyncio
+import re
+
+from functools import cached_property
 from typing import Dict, Any, Optional, List
 from loguru import logger
-from openai import OpenAI
+from openai import AsyncOpenAI
 
 from ...config.setting import settings
 from ...models.query import QueryResult
 from ...models.database import DatabaseResponse
+from ...models.advisory import AgentResponse
 from .context_manager import DataProcessor
 from .agents import ContentResultsAgent, DistributionAgent, AdvisoryAgent
+from .http import SHARED_HTTPX
+from . import response_cache
 from ..session_handler import SessionHandler
 
+# One compiled scan over the query instead of a substring check per keyword;
+# word boundaries also stop "hi" from matching inside e.g. "this"
+_CONV_RE = re.compile(
+    r"\b(?:hi|hello|hey|thanks|thank\s+you|help|what\s+(?:can|do)\s+you\s+do)\b",
+    re.IGNORECASE
+)
+
+# Static response fragments - allocated once instead of per call
+_CONV_SUGGESTIONS = (
+    "Show me my content overview",
+    "What content categories do I have?",
+    "Analyze my content distribution",
+    "What strategic opportunities do I have?"
+)
+_FALLBACK_SUGGESTIONS = (
+    "Show me my content overview",
+    "What content categories do I have?",
+    "Help me understand my content distribution",
+    "What strategic opportunities do I have?"
+)
+_FALLBACK_MESSAGES = {
+    'list': "I found your content but having trouble analyzing it right now.",
+    'semantic': "I found matching content but having trouble providing insights right now.",
+    'distribution': "I have your distribution data but having trouble analyzing patterns right now.",
+    'pure_advisory': "I encountered an issue generating strategic insights, but I can still help with your content strategy."
+}
+
 
 class AdvisoryOrchestrator:
     """
@@ -23,23 +57,94 @@ class AdvisoryOrchestrator:
     """
     
     def __init__(self, openai_api_key: str = None, mongo_uri: str = None, db_name: str = None):
-        # Initialize OpenAI client for agents
-        openai_client = OpenAI(api_key=openai_api_key or settings.OPENAI_API_KEY)
-        
+        # Async OpenAI client - agents await the API instead of blocking a
+        # worker thread for the whole round-trip. Shared httpx pool so all
+        # orchestrator traffic multiplexes over the same sockets.
+        self.client = AsyncOpenAI(
+            api_key=openai_api_key or settings.OPENAI_API_KEY,
+            http_client=SHARED_HTTPX
+        )
+
         # Initialize components (same as existing)
         self.data_processor = DataProcessor()
         self.session_handler = SessionHandler(
-            mongo_uri=mongo_uri, 
-            db_name=db_name, 
+            mongo_uri=mongo_uri,
+            db_name=db_name,
             max_memory_length=6
         )
-        
-        # Initialize domain agents (existing)
-        self.content_agent = ContentResultsAgent(openai_client, self.data_processor)
-        self.distribution_agent = DistributionAgent(openai_client, self.data_processor) 
-        self.advisory_agent = AdvisoryAgent(openai_client, self.data_processor)
-    
-    def generate_response(
+
+        # Singleflight map: concurrent identical requests await the first
+        # caller's future instead of each issuing their own OpenAI call.
+        # Orthogonal to the response cache - this collapses concurrent misses.
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._inflight_lock = asyncio.Lock()
+
+    # Agents are built on first use: a process that only ever serves one
+    # operation type never pays for the other two
+    @cached_property
+    def content_agent(self) -> ContentResultsAgent:
+        return ContentResultsAgent(self.client, self.data_processor)
+
+    @cached_property
+    def distribution_agent(self) -> DistributionAgent:
+        return DistributionAgent(self.client, self.data_processor)
+
+    @cached_property
+    def advisory_agent(self) -> AdvisoryAgent:
+        return AdvisoryAgent(self.client, self.data_processor)
+
+    async def generate_response(
+        self,
+        operation: str,
+        query_result: QueryResult,
+        db_response: DatabaseResponse,
+        tenant_schema: Dict,
+        original_query: str,
+        session_id: Optional[str] = None,
+        tenant_id: Optional[str] = None
+    ) -> AgentResponse:
+        """
+        Generate response with in-flight deduplication
+        Bursty duplicates (dashboard reloads, retry storms) share one pipeline run
+        """
+        key = response_cache.make_key(
+            operation, original_query, tenant_id or query_result.tenant_id, session_id
+        )
+
+        async with self._inflight_lock:
+            existing = self._inflight.get(key)
+            if existing is None:
+                future: asyncio.Future = asyncio.get_running_loop().create_future()
+                self._inflight[key] = future
+
+        if existing is not None:
+            logger.debug("Coalescing duplicate in-flight request: {}", key[:16])
+            return await existing
+
+        try:
+            result = await self._generate_response(
+                operation=operation,
+                query_result=query_result,
+                db_response=db_response,
+                tenant_schema=tenant_schema,
+                original_query=original_query,
+                session_id=session_id,
+                tenant_id=tenant_id
+            )
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            # If the leader was cancelled (client disconnect) the future was
+            # never resolved - cancel it so coalesced waiters don't hang
+            if not future.done():
+                future.cancel()
+            async with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+    async def _generate_response(
         self,
         operation: str,
         query_result: QueryResult,
@@ -48,14 +153,16 @@ class AdvisoryOrchestrator:
         original_query: str,
         session_id: Optional[str] = None,
         tenant_id: Optional[str] = None
-    ) -> Dict[str, Any]:
+    ) -> AgentResponse:
         """
         Direct orchestration - single path to appropriate agent
         No LangChain tools or multiple API calls
         """
         try:
             # Build context using existing DataProcessor (enhanced version)
-            context = self.data_processor.build_context(
+            # Runs off the loop - it may read session history from Mongo
+            context = await asyncio.to_thread(
+                self.data_processor.build_context,
                 operation=operation,
                 query_result=query_result,
                 db_response=db_response,
@@ -65,77 +172,120 @@ class AdvisoryOrchestrator:
                 session_handler=self.session_handler,
                 tenant_id=tenant_id or query_result.tenant_id
             )
-            
+
             # Direct routing based on operation (no LangChain decision making)
-            agent_response = self._route_to_agent(operation, context, original_query)
-            
-            
+            agent_response = await self._route_to_agent(operation, context, original_query)
+
+
             return agent_response
-            
+
         except Exception as e:
             logger.error(f"Simple orchestrator error: {e}")
             return self._fallback_response(original_query, operation)
-    
-    def _route_to_agent(self, operation: str, context: Dict[str, Any], query: str) -> Dict[str, Any]:
+
+    async def generate_response_stream(
+        self,
+        operation: str,
+        query_result: QueryResult,
+        db_response: DatabaseResponse,
+        tenant_schema: Dict,
+        original_query: str,
+        session_id: Optional[str] = None,
+        tenant_id: Optional[str] = None
+    ):
+        """
+        Streaming variant of generate_response
+        Yields {"type": "token", "content": ...} events as the LLM generates,
+        then one {"type": "meta", ...} event with suggestions and confidence
+        """
+        context = await asyncio.to_thread(
+            self.data_processor.build_context,
+            operation=operation,
+            query_result=query_result,
+            db_response=db_response,
+            tenant_schema=tenant_schema,
+            original_query=original_query,
+            session_id=session_id,
+            session_handler=self.session_handler,
+            tenant_id=tenant_id or query_result.tenant_id
+        )
+
+        if operation in ["list", "semantic"]:
+            agent = self.content_agent
+        elif operation == "distribution":
+            agent = self.distribution_agent
+        else:
+            agent = self.advisory_agent
+
+        async for chunk in agent.generate_response_stream(context):
+            yield {"type": "token", "content": chunk}
+
+        yield {
+            "type": "meta",
+            "suggested_questions": agent.get_suggested_questions(context),
+            "confidence": "high"
+        }
+
+    async def _route_to_agent(self, operation: str, context: Dict[str, Any], query: str) -> AgentResponse:
         """
         Direct routing - no AI decision making overhead
         Single agent call based on operation type
         """
-        
+
         # Direct routing based on operation
         if operation in ["list", "semantic"]:
-            return self.content_agent.generate_response(context)
+            return await self.content_agent.generate_response(context)
         elif operation == "distribution":
-            return self.distribution_agent.generate_response(context)
+            return await self.distribution_agent.generate_response(context)
+        elif operation == "comprehensive":
+            # Broad questions need both views - run the two agents
+            # concurrently so two LLM round-trips cost one wall-clock window
+            dist_response, advisory_response = await asyncio.gather(
+                self.distribution_agent.generate_response(context),
+                self.advisory_agent.generate_response(context)
+            )
+            return self._merge_agent_responses(dist_response, advisory_response)
         else:  # pure_advisory or unknown
-            return self.advisory_agent.generate_response(context)
+            return await self.advisory_agent.generate_response(context)
+
+    def _merge_agent_responses(self, *responses: AgentResponse) -> AgentResponse:
+        """Combine parallel agent outputs into one response"""
+        combined = "\n\n".join(r.response for r in responses if r.response)
+
+        # Union of suggestions, first occurrence wins, capped at 4
+        suggestions = tuple(dict.fromkeys(
+            q for r in responses for q in r.suggested_questions
+        ))[:4]
+
+        confidences = [r.confidence for r in responses]
+        confidence = confidences[0] if len(set(confidences)) == 1 else "medium"
+
+        return AgentResponse(
+            response=combined,
+            suggested_questions=suggestions,
+            confidence=confidence
+        )
     
     def _is_conversational_query(self, query: str) -> bool:
         """Lightweight conversational detection"""
-        if not query or not query.strip():
-            return False
-        
-        query_lower = query.strip().lower()
-        conversational_keywords = [
-            "hi", "hello", "hey", "thanks", "thank you", 
-            "help", "what can you do", "what do you do"
-        ]
-        
-        return any(keyword in query_lower for keyword in conversational_keywords)
+        return bool(query and _CONV_RE.search(query))
     
-    def _default_conversational_response(self) -> Dict[str, Any]:
+    def _default_conversational_response(self) -> AgentResponse:
         """Default conversational response"""
-        return {
-            "response": "Hello! I can help you analyze your content library. What would you like to explore?",
-            "suggested_questions": [
-                "Show me my content overview",
-                "What content categories do I have?",
-                "Analyze my content distribution",
-                "What strategic opportunities do I have?"
-            ],
-            "confidence": "high"
-        }
+        return AgentResponse(
+            response="Hello! I can help you analyze your content library. What would you like to explore?",
+            suggested_questions=_CONV_SUGGESTIONS,
+            confidence="high"
+        )
 
-    
-    def _fallback_response(self, query: str, operation: str) -> Dict[str, Any]:
+
+    def _fallback_response(self, query: str, operation: str) -> AgentResponse:
         """Fallback response with operation-specific messaging"""
-        fallback_messages = {
-            'list': "I found your content but having trouble analyzing it right now.",
-            'semantic': "I found matching content but having trouble providing insights right now.", 
-            'distribution': "I have your distribution data but having trouble analyzing patterns right now.",
-            'pure_advisory': "I encountered an issue generating strategic insights, but I can still help with your content strategy."
-        }
-        
-        return {
-            "response": fallback_messages.get(operation, "I encountered an issue processing your request. Please try rephrasing your question."),
-            "suggested_questions": [
-                "Show me my content overview",
-                "What content categories do I have?", 
-                "Help me understand my content distribution",
-                "What strategic opportunities do I have?"
-            ],
-            "confidence": "low"
-        }
+        return AgentResponse(
+            response=_FALLBACK_MESSAGES.get(operation, "I encountered an issue processing your request. Please try rephrasing your question."),
+            suggested_questions=_FALLBACK_SUGGESTIONS,
+            confidence="low"
+        )
     
     # Interface methods for compatibility with existing service
     def clear_session(self, session_id: Optional[str] = None):
@@ -165,9 +315,20 @@ class AdvisoryOrchestrator:
 
 # Factory function for service integration
 def create_simple_advisory_orchestrator(
-    openai_api_key: str = None, 
-    mongo_uri: str = None, 
+    openai_api_key: str = None,
+    mongo_uri: str = None,
     db_name: str = None
 ) -> AdvisoryOrchestrator:
     """Create simple orchestrator with direct routing"""
-    return AdvisoryOrchestrator(openai_api_key, mongo_uri, db_name)
\ No newline at end of file
+    return AdvisoryOrchestrator(openai_api_key, mongo_uri, db_name)
+
+
+# Shared orchestrator instance, created once at import. One OpenAI client
+# (one persistent connection pool), one in-flight map, and one session
+# handler for every service instead of a copy per service.
+advisory_orchestrator = AdvisoryOrchestrator()
+
+
+def get_advisory_orchestrator() -> AdvisoryOrchestrator:
+    """Get the shared orchestrator instance"""
+    return advisory_orchestrator
\ No newline at end of file
@@ -6,44 +6,407 @@ Now includes token tracking for debugging
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+import asyncio
+import re
 import time
+import orjson
+import openai
 from loguru import logger
-from openai import OpenAI
+from openai import AsyncOpenAI
+from tenacity import (
+    AsyncRetrying,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
 
 from ...config.setting import settings
-from ...utilities.token_calculator import log_token_usage
+from ...models.advisory import AgentResponse
+from ...utilities.batch_llm import submit_chat_batch
+from ...utilities.token_calculator import log_token_usage, token_calculator
+from . import response_cache, semantic_cache
+
+# Cap concurrent OpenAI calls so a burst of requests degrades into queueing
+# instead of rate-limit errors
+_llm_semaphore = asyncio.Semaphore(settings.OPENAI_MAX_CONCURRENCY)
+
+# Transient failures worth retrying - anything else fails straight through.
+# APITimeoutError is an APIConnectionError subclass, so timeouts retry too.
+_RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
+
+# Input budget for a single user prompt. Well inside every supported model's
+# context window, so over-budget API rejections (which force the fallback
+# path at worst-case latency) can't happen
+_MAX_PROMPT_TOKENS = 8000
+
+
+class CircuitOpenError(Exception):
+    """Fast-fail raised while the LLM circuit breaker is open"""
+
+
+# Circuit breaker: after enough consecutive failures, skip the API entirely
+# for a cooldown window so callers hit their fallbacks in microseconds
+# instead of stacking 30s timeouts during an OpenAI incident
+_BREAKER_THRESHOLD = 5
+_BREAKER_COOLDOWN = 30.0
+_consecutive_failures = 0
+_circuit_opened_at = 0.0
+
+
+def _check_llm_breaker() -> None:
+    """Raise CircuitOpenError while the circuit is open"""
+    global _consecutive_failures
+    if _consecutive_failures >= _BREAKER_THRESHOLD:
+        if time.monotonic() - _circuit_opened_at < _BREAKER_COOLDOWN:
+            raise CircuitOpenError("LLM circuit open - skipping OpenAI call")
+        # Cooldown elapsed - let one probe call through
+        _consecutive_failures = _BREAKER_THRESHOLD - 1
+
+
+def _record_llm_success() -> None:
+    global _consecutive_failures
+    _consecutive_failures = 0
+
+
+def _record_llm_failure() -> None:
+    global _consecutive_failures, _circuit_opened_at
+    _consecutive_failures += 1
+    if _consecutive_failures == _BREAKER_THRESHOLD:
+        _circuit_opened_at = time.monotonic()
+        logger.warning("LLM circuit breaker opened after {} consecutive failures",
+                       _BREAKER_THRESHOLD)
+
+# Static instruction blocks live in the system prompt so OpenAI's automatic
+# prompt caching can reuse the byte-identical prefix across requests; only
+# per-request data goes in the user message.
+_CONTENT_SYSTEM_PROMPT = """You are a content analyst who provides actionable insights. Be direct and helpful.
+
+Steps to follow to answer a query: first analyze the query of user find what they actually need,
+then look at the Context and find relevant insights and then first answer the query of user
+(If no data is found say that you might not have that particular query related data (mention that in response) or you can try different search terms)
+Only provide insights when needed otherwise ignore the context and just answer the query.
+Provide a helpful response that:
+1. States what was found
+2. Keeps response under 150 words
+3. Be conversational and actionable"""
+
+_DISTRIBUTION_SYSTEM_PROMPT = """You are a data analyst. Provide clear distribution insights with specific numbers.
+
+Analyze the distribution and provide:
+1. STRICT RULE: Focus only on data relevant to the user's query (if query is about category X, only discuss category X not the whole Distribution Data)
+2. Steps to follow to answer a query: first analyze the query of user find what they actually need, then look at the Distribution Data and find relevant insights and
+then first answer the query of user as per question and then provide additional insights if relevant. remember to first answer the query of user as per question.
+3. Identify patterns, gaps, or concentrations in the data
+4. Keep response concise and user-focused (max 150 words)
+5. Highlight specific categories and percentages when relevant
+6. Do not give the intent analysis just provide the answer"""
+
+_ADVISORY_SYSTEM_PROMPT = """You are a strategic business advisor who provides actionable content strategy advice based on actual client data. Use specific numbers and patterns from their content library to give targeted recommendations.
+
+ROLE: Strategic Content Business Advisor
+TASK: Provide strategic guidance based on actual client content data
+
+STRATEGIC ANALYSIS FRAMEWORK:
+
+1. INTENT CLASSIFICATION:
+- GREETING/CAPABILITY: Simple introduction or capability questions
+- OVERVIEW: "What do you know", "tell me about my content", "what do you do"
+- SPECIFIC STRATEGIC: Focus on particular category/area
+- COMPREHENSIVE: Full strategic analysis request
+- OPTIMIZATION: "How to improve", "what should I prioritize"
+
+2. RESPONSE PROTOCOLS BY INTENT:
+
+GREETING/CAPABILITY -> Welcome + brief capability overview (50 words)
+
+OVERVIEW -> Content library summary with key highlights (100-150 words):
+- Total content scope
+- 2-3 strongest categories
+- 1-2 notable patterns or opportunities
+
+SPECIFIC STRATEGIC -> Targeted analysis (150-200 words):
+- Deep dive on requested category/area
+- Specific recommendations with data support
+- Next steps for that focus area
+
+COMPREHENSIVE -> Full strategic assessment (250-300 words):
+- Portfolio overview with strengths/gaps
+- Priority recommendations ranked by impact
+- Strategic roadmap suggestions
+
+OPTIMIZATION -> Improvement-focused advice (200-250 words):
+- Identify top 3 optimization opportunities
+- Resource allocation recommendations
+- Measurable next steps
+
+3. DATA USAGE REQUIREMENTS:
+- Reference specific numbers when making strategic points
+- Compare categories to identify relative strengths
+- Base all recommendations on actual content distribution
+- Provide concrete, actionable advice
+
+4. RESPONSE QUALITY STANDARDS:
+- Start with direct response to user's specific question
+- Use client's actual data to support all strategic points
+- Provide actionable recommendations, not generic advice
+- Maintain professional consulting tone
+- Reference conversation history for coherent multi-turn dialogue
+
+CONSTRAINTS:
+- Only discuss content strategy and library optimization
+- Base all advice on provided data, not assumptions
+- For irrelevant queries: "This question isn't related to your content strategy. I can help you with content analysis or strategic planning. What would you like to focus on?"
+- For insufficient context: Ask for clarification with 3-4 specific options
+
+OUTPUT: Strategic advisory response following above protocols"""
+
+# Model routing for the advisory agent: greetings, capability questions and
+# broad overview asks get a short answer from the cheaper model; anything
+# with strategic/optimization language keeps the flagship. Mirrors the
+# GREETING/CAPABILITY and OVERVIEW intents enumerated in the system prompt.
+_LIGHT_INTENT_RE = re.compile(
+    r"^\s*(?:hi|hello|hey|thanks|thank\s+you)\b"
+    r"|what\s+(?:can|do)\s+you\s+(?:do|know)"
+    r"|tell\s+me\s+about\s+my\s+content",
+    re.IGNORECASE
+)
+_HEAVY_INTENT_RE = re.compile(
+    r"\b(?:detailed|comprehensive|strateg\w*|optimi[sz]\w*|improve|"
+    r"prioriti[sz]\w*|roadmap|recommend\w*)\b",
+    re.IGNORECASE
+)
+
+
+@lru_cache(maxsize=256)
+def _compose_advisory_system_prompt(total_content: int, category_count: int,
+                                    category_summary: str) -> str:
+    """Assemble the full advisory system message once per tenant state
+
+    The ~2k-token rules block plus profile is identical across a tenant's
+    turns; caching the concatenation also guarantees the byte-for-byte
+    stability OpenAI's prefix cache keys on.
+    """
+    return f"""{_ADVISORY_SYSTEM_PROMPT}
+
+CLIENT DATA PROFILE:
+- Total Content Library: {total_content} pieces
+- Content Categories: {category_count} active categories
+- Category Breakdown:
+{category_summary}"""
+
+
+@lru_cache(maxsize=512)
+def _format_category_summary(items_tuple: Tuple[Tuple[str, Tuple[Tuple[str, int], ...]], ...]) -> str:
+    """Format the per-category breakdown for the advisory prompt
+
+    Cached on a hashable snapshot of the counts: a tenant's categories change
+    far less often than they are asked about, so the sum/sort/format work
+    runs once per distinct distribution instead of on every request
+    """
+    summary = ""
+    for cat_name, cat_items in items_tuple:
+        total_in_cat = sum(v for _, v in cat_items)
+        top_items = sorted(cat_items, key=lambda x: x[1], reverse=True)[:3]
+        summary += f"{cat_name}: {total_in_cat} total (top: {', '.join([f'{k}({v})' for k, v in top_items])})\n"
+    return summary
+
+
+# Static suggestion sets - one tuple each at import instead of a fresh list
+# allocated on every response
+_NO_RESULT_SUGGESTIONS = (
+    "Try different search terms",
+    "Check other content categories",
+    "Show me all content types"
+)
+_CONTENT_SUGGESTIONS = (
+    "Analyze distribution of this content",
+    "Show me gaps in this area",
+    "What patterns exist in these results?"
+)
+_CONTENT_FALLBACK_SUGGESTIONS = (
+    "Show me content categories",
+    "What content do I have?",
+    "Help me explore my library"
+)
+_DIST_SUGGESTIONS = (
+    "Show me content in underrepresented areas",
+    "What topics are missing?",
+    "How can I rebalance this?"
+)
+_DIST_FALLBACK_SUGGESTIONS = (
+    "What categories do I have?",
+    "Show me content organization",
+    "How is content categorized?"
+)
+_ADVISORY_SUGGESTIONS = (
+    "How can I optimize my content strategy?",
+    "What strategic opportunities should I focus on?",
+    "What should be my next content priority?"
+)
+_ADVISORY_FALLBACK_SUGGESTIONS = (
+    "How can I improve my content strategy?",
+    "What strategic opportunities should I focus on?",
+    "Help me plan my content roadmap",
+    "Where should I invest my content efforts?"
+)
+
+
+def _stable_json(obj: Any) -> str:
+    """Serialize dynamic prompt data with sorted keys so repeated calls
+    produce byte-identical text (raw dict reprs have unstable ordering)"""
+    return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS, default=str).decode()
 
 
 class BaseAgent(ABC):
     """Base class for all advisory agents - UNCHANGED"""
     
-    def __init__(self, openai_client: OpenAI, data_processor):
+    def __init__(self, openai_client: AsyncOpenAI, data_processor):
         self.client = openai_client
         self.data_processor = data_processor
+        # Bound once - skips a pydantic attribute lookup per LLM call
+        self._model = settings.OPENAI_MODEL
     
     @abstractmethod
-    def generate_response(self, context: Dict[str, Any]) -> Dict[str, Any]:
+    async def generate_response(self, context: Dict[str, Any]) -> AgentResponse:
         """Generate response based on context"""
         pass
-    
-    def _call_llm(self, system_prompt: str, user_prompt: str, temperature: float = 0.3, max_tokens: int = 300) -> str:
-        """Call OpenAI with error handling"""
+
+    # Batch parameters mirror the agent's interactive _call_llm arguments;
+    # AdvisoryAgent overrides both
+    _BATCH_TEMPERATURE = 0.3
+    _BATCH_MAX_TOKENS = 300
+
+    def _batch_prompt(self, context: Dict[str, Any]) -> Dict[str, str]:
+        """Build the {"system", "user"} prompt pair for one batch entry"""
+        raise NotImplementedError
+
+    def generate_response_batch(self, contexts: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Submit many contexts as one OpenAI batch (offline analytics path)
+
+        Non-interactive work (tenant onboarding sweeps, nightly reports)
+        runs at half the synchronous price with a 24h completion window.
+        Returns the submit_chat_batch receipt ({"batch_id", "custom_ids"});
+        collect responses later with batch_llm.get_batch_results.
+        """
+        prompts = [self._batch_prompt(context) for context in contexts]
+        return submit_chat_batch(
+            prompts,
+            model=self._model,
+            temperature=self._BATCH_TEMPERATURE,
+            max_tokens=self._BATCH_MAX_TOKENS
+        )
+
+
+    async def _call_llm(self, system_prompt: str, user_prompt: str, temperature: float = 0.3,
+                        max_tokens: int = 300, bypass_cache: bool = False,
+                        model: Optional[str] = None) -> str:
+        """Call OpenAI with error handling (non-blocking - frees the event loop)
+
+        Identical (prompts, model, temperature) calls within the cache TTL
+        return the stored completion without an API round-trip. Only
+        low-temperature calls participate: replaying one frozen sample of a
+        deliberately varied distribution (advisory runs at 0.4) would pin
+        every user to the same phrasing. model overrides the configured
+        default for calls routed to a cheaper tier.
+        """
+        model = model or self._model
+        cacheable = temperature <= 0.3
+        cache_key = response_cache.make_key(
+            system_prompt, user_prompt, model, temperature, max_tokens
+        )
+        if cacheable and not bypass_cache:
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        _check_llm_breaker()
         try:
-            completion = self.client.chat.completions.create(
-                model=settings.OPENAI_MODEL,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=temperature,
-                max_tokens=max_tokens,
-            )
-            return completion.choices[0].message.content.strip()
+            # Jittered exponential backoff on transient 429/5xx - most blips
+            # resolve within a retry or two instead of forcing the fallback
+            async for attempt in AsyncRetrying(
+                retry=retry_if_exception_type(_RETRYABLE_ERRORS),
+                wait=wait_exponential_jitter(initial=0.5, max=8.0),
+                stop=stop_after_attempt(3),
+                reraise=True,
+            ):
+                with attempt:
+                    async with _llm_semaphore:
+                        completion = await self.client.chat.completions.create(
+                            model=model,
+                            messages=[
+                                {"role": "system", "content": system_prompt},
+                                {"role": "user", "content": user_prompt}
+                            ],
+                            temperature=temperature,
+                            max_tokens=max_tokens,
+                        )
+            response_text = completion.choices[0].message.content.strip()
+            _record_llm_success()
+            if cacheable:
+                response_cache.put(cache_key, response_text)
+            return response_text
         except Exception as e:
+            _record_llm_failure()
             logger.error(f"LLM call failed: {e}")
             raise
 
+    async def _call_llm_stream(self, system_prompt: str, user_prompt: str,
+                               temperature: float = 0.3, max_tokens: int = 300,
+                               model: Optional[str] = None):
+        """Stream completion tokens as they arrive (time-to-first-token ~300ms
+        instead of waiting out the full generation)
+
+        Cache hits yield the stored completion in one chunk; misses stream
+        from the API and write the aggregated text back to the cache so the
+        non-streaming path benefits too.
+        """
+        model = model or self._model
+        cacheable = temperature <= 0.3
+        cache_key = response_cache.make_key(
+            system_prompt, user_prompt, model, temperature, max_tokens
+        )
+        if cacheable:
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                yield cached
+                return
+
+        _check_llm_breaker()
+        parts: List[str] = []
+        try:
+            # No mid-stream retry - tokens already sent can't be unsent.
+            # The breaker still counts failures so streams fast-fail too.
+            async with _llm_semaphore:
+                stream = await self.client.chat.completions.create(
+                    model=model,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt}
+                    ],
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    stream=True,
+                )
+                async for chunk in stream:
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        parts.append(delta)
+                        yield delta
+        except Exception:
+            _record_llm_failure()
+            raise
+        _record_llm_success()
+
+        if cacheable and parts:
+            response_cache.put(cache_key, "".join(parts).strip())
+
 
 class ContentResultsAgent(BaseAgent):
     """
@@ -51,7 +414,7 @@ class ContentResultsAgent(BaseAgent):
     No intermediate insight processing - just raw context to LLM
     """
     
-    def generate_response(self, context: Dict[str, Any]) -> Dict[str, Any]:
+    async def generate_response(self, context: Dict[str, Any]) -> AgentResponse:
         """Generate response using context directly"""
         
         query = context.get("original_query", "")
@@ -64,28 +427,71 @@ class ContentResultsAgent(BaseAgent):
         
         # Build prompt directly from context - no extra processing
         prompt = self._build_content_prompt(query, data_results, context)
-        
+
+        # Paraphrase lookup: a semantically equivalent query from the same
+        # tenant/schema skips the LLM entirely. The embedding call is sync
+        # OpenAI, so keep it off the event loop.
+        guard = context.get("cache_guard", "")
+        cached, query_vector = await asyncio.to_thread(
+            semantic_cache.lookup, query, guard
+        )
+        if cached is not None:
+            return AgentResponse(
+                response=cached,
+                suggested_questions=self._generate_simple_suggestions(data_results),
+                confidence="high"
+            )
+
         try:
-            response_text = self._call_llm(
-                system_prompt="You are a content analyst who provides actionable insights. Be direct and helpful.",
+            response_text = await self._call_llm(
+                system_prompt=_CONTENT_SYSTEM_PROMPT,
                 user_prompt=prompt,
                 temperature=0.3,
                 max_tokens=300
             )
-            
+            if query_vector is not None:
+                semantic_cache.store(query_vector, guard, response_text)
+
             suggestions = self._generate_simple_suggestions(data_results)
-            
-            return {
-                "response": response_text,
-                "suggested_questions": suggestions,
-                "confidence": "high"
-            }
+
+            return AgentResponse(
+                response=response_text,
+                suggested_questions=suggestions,
+                confidence="high"
+            )
             
         except Exception as e:
             logger.error(f"Content agent error: {e}")
             return self._fallback_response(query, data_results)
-    
-    
+
+    async def generate_response_stream(self, context: Dict[str, Any]):
+        """Stream the content analysis as token chunks"""
+        query = context.get("original_query", "")
+        data_results = context.get("data_results", {})
+        prompt = self._build_content_prompt(query, data_results, context)
+
+        try:
+            async for chunk in self._call_llm_stream(
+                _CONTENT_SYSTEM_PROMPT, prompt, temperature=0.3, max_tokens=300
+            ):
+                yield chunk
+        except Exception as e:
+            logger.error(f"Content agent stream error: {e}")
+            yield self._fallback_response(query, data_results).response
+
+    def get_suggested_questions(self, context: Dict[str, Any]) -> Sequence[str]:
+        """Suggestions for the streaming path (computed without the LLM)"""
+        return self._generate_simple_suggestions(context.get("data_results", {}))
+
+    def _batch_prompt(self, context: Dict[str, Any]) -> Dict[str, str]:
+        query = context.get("original_query", "")
+        return {
+            "system": _CONTENT_SYSTEM_PROMPT,
+            "user": self._build_content_prompt(
+                query, context.get("data_results", {}), context
+            )
+        }
+
     def _build_content_prompt(self, query: str, data_results: Dict, context: Dict) -> str:
         """
         SIMPLIFIED: Build prompt directly from context
@@ -96,39 +502,53 @@ class ContentResultsAgent(BaseAgent):
         
         total_found = data_results.get("total_found", 0)
         showing = data_results.get("showing", total_found)
-        
-        # Use context directly - pass what we have to LLM
-        return f"""
+
+        # Only the fields the model actually needs - the query is already in
+        # the prompt and operation/response_type are routing metadata. Fewer
+        # prompt tokens means lower cost and faster time-to-first-token
+        slim_context = {
+            k: context[k] for k in ("data_results", "previous_context") if k in context
+        }
+
+        # Only per-request data here - the instructions live in the (cacheable)
+        # system prompt
+        def _assemble(ctx: Dict) -> str:
+            return f"""
 Query: "{query}"
 Results: Found {total_found} content pieces (showing {showing})
-Context: {context}
-
-Steps to follow to answer a query : first analyze the query of user find what they actually need, 
-then look at the Context and find relevant insights and then first answer the query of user 
-(If no data is found say that you might not have that particular query related data(mention that in response) or you can try different search terms)
-Only provide insights when needed other wise ignore the context and just answer the query
-Provide a helpful response that: 
-1. States what was found
-2. Keeps response under 150 words
-3. Be conversational and actionable
+Context: {_stable_json(ctx)}
 """
+
+        prompt = _assemble(slim_context)
+
+        # Keep the prompt inside the input budget: drop conversation history
+        # first, then the aggregated insights, rather than letting the API
+        # reject the request outright
+        if token_calculator.count_tokens(prompt) > _MAX_PROMPT_TOKENS:
+            slim_context.pop("previous_context", None)
+            prompt = _assemble(slim_context)
+        if token_calculator.count_tokens(prompt) > _MAX_PROMPT_TOKENS:
+            data_results_slim = {
+                k: v for k, v in slim_context.get("data_results", {}).items()
+                if k != "content_insights"
+            }
+            slim_context["data_results"] = data_results_slim
+            logger.warning("Content prompt over token budget - dropped insights block")
+            prompt = _assemble(slim_context)
+
+        # Count only when DEBUG is actually emitted
+        logger.opt(lazy=True).debug(
+            "Content prompt tokens: {}", lambda: token_calculator.count_tokens(prompt)
+        )
+        return prompt
     
-    def _generate_simple_suggestions(self, data_results: Dict) -> List[str]:
+    def _generate_simple_suggestions(self, data_results: Dict) -> Sequence[str]:
         """Simple suggestion generation"""
         if data_results.get("status") == "no_results":
-            return [
-                "Try different search terms",
-                "Check other content categories", 
-                "Show me all content types"
-            ]
-        
-        return [
-            "Analyze distribution of this content",
-            "Show me gaps in this area",
-            "What patterns exist in these results?"
-        ]
+            return _NO_RESULT_SUGGESTIONS
+        return _CONTENT_SUGGESTIONS
     
-    def _fallback_response(self, query: str, data_results: Dict) -> Dict[str, Any]:
+    def _fallback_response(self, query: str, data_results: Dict) -> AgentResponse:
         """Simple fallback"""
         total_found = data_results.get("total_found", 0)
         
@@ -137,15 +557,11 @@ Provide a helpful response that:
         else:
             response = "No content found. Try different search terms."
         
-        return {
-            "response": response,
-            "suggested_questions": [
-                "Show me content categories",
-                "What content do I have?",
-                "Help me explore my library"
-            ],
-            "confidence": "medium"
-        }
+        return AgentResponse(
+            response=response,
+            suggested_questions=_CONTENT_FALLBACK_SUGGESTIONS,
+            confidence="medium"
+        )
 
 
 
@@ -154,7 +570,7 @@ class DistributionAgent(BaseAgent):
     SIMPLIFIED: Uses context directly for distribution analysis
     """
     
-    def generate_response(self, context: Dict[str, Any]) -> Dict[str, Any]:
+    async def generate_response(self, context: Dict[str, Any]) -> AgentResponse:
         """Generate distribution response from context directly"""
         
         query = context.get("original_query", "")
@@ -162,29 +578,67 @@ class DistributionAgent(BaseAgent):
         
         # Simple prompt building - no complex processing
         prompt = self._build_distribution_prompt(query, dist_results)
-        
+
+        # Same paraphrase lookup as the content agent
+        guard = context.get("cache_guard", "")
+        cached, query_vector = await asyncio.to_thread(
+            semantic_cache.lookup, query, guard
+        )
+        if cached is not None:
+            return AgentResponse(
+                response=cached,
+                suggested_questions=_DIST_SUGGESTIONS,
+                confidence="high"
+            )
+
         try:
-            response_text = self._call_llm(
-                system_prompt="You are a data analyst. Provide clear distribution insights with specific numbers.",
+            response_text = await self._call_llm(
+                system_prompt=_DISTRIBUTION_SYSTEM_PROMPT,
                 user_prompt=prompt,
                 temperature=0.3,
                 max_tokens=300
             )
-            
-            return {
-                "response": response_text,
-                "suggested_questions": [
-                    "Show me content in underrepresented areas",
-                    "What topics are missing?",
-                    "How can I rebalance this?"
-                ],
-                "confidence": "high"
-            }
+            if query_vector is not None:
+                semantic_cache.store(query_vector, guard, response_text)
+
+            return AgentResponse(
+                response=response_text,
+                suggested_questions=_DIST_SUGGESTIONS,
+                confidence="high"
+            )
             
         except Exception as e:
             logger.error(f"Distribution agent error: {e}")
             return self._fallback_distribution_response(query, dist_results)
-    
+
+    async def generate_response_stream(self, context: Dict[str, Any]):
+        """Stream the distribution analysis as token chunks"""
+        query = context.get("original_query", "")
+        dist_results = context.get("distribution_results", {})
+        prompt = self._build_distribution_prompt(query, dist_results)
+
+        try:
+            async for chunk in self._call_llm_stream(
+                _DISTRIBUTION_SYSTEM_PROMPT, prompt, temperature=0.3, max_tokens=300
+            ):
+                yield chunk
+        except Exception as e:
+            logger.error(f"Distribution agent stream error: {e}")
+            yield self._fallback_distribution_response(query, dist_results).response
+
+    def get_suggested_questions(self, context: Dict[str, Any]) -> Sequence[str]:
+        """Suggestions for the streaming path"""
+        return _DIST_SUGGESTIONS
+
+    def _batch_prompt(self, context: Dict[str, Any]) -> Dict[str, str]:
+        return {
+            "system": _DISTRIBUTION_SYSTEM_PROMPT,
+            "user": self._build_distribution_prompt(
+                context.get("original_query", ""),
+                context.get("distribution_results", {})
+            )
+        }
+
     def _build_distribution_prompt(self, query: str, dist_results: Dict) -> str:
         """Simple distribution prompt"""
         if dist_results.get("status") == "no_distribution":
@@ -192,29 +646,16 @@ class DistributionAgent(BaseAgent):
         
         return f"""
 Query: "{query}"
-Distribution Data: {dist_results}
-
-Analyze the distribution and provide:
-1. STRICT RULE : Focus only on data relevant to the user's query (if query is about category X, only discuss category X not the whole Distribution Data)
-2. Steps to follow to answer a query : first analyze the query of user find what they actually need, then look at the Distribution Data and find relevant insights and
-then first answer the query of user as per question and then provide additional insights if relevant. remember to first answer the query of user as per question.
-3. Identify patterns, gaps, or concentrations in the data
-4. Keep response concise and user-focused (max 150 words)
-5. Highlight specific categories and percentages when relevant
-6. Do not give the intent analysis just provide the answer
+Distribution Data: {_stable_json(dist_results)}
 """
     
-    def _fallback_distribution_response(self, query: str, dist_results: Dict) -> Dict[str, Any]:
+    def _fallback_distribution_response(self, query: str, dist_results: Dict) -> AgentResponse:
         """Simple fallback for distribution"""
-        return {
-            "response": "I have distribution data but had trouble analyzing patterns. What specific insights would help?",
-            "suggested_questions": [
-                "What categories do I have?",
-                "Show me content organization",
-                "How is content categorized?"
-            ],
-            "confidence": "medium"
-        }
+        return AgentResponse(
+            response="I have distribution data but had trouble analyzing patterns. What specific insights would help?",
+            suggested_questions=_DIST_FALLBACK_SUGGESTIONS,
+            confidence="medium"
+        )
 
 
 class AdvisoryAgent(BaseAgent):
@@ -223,7 +664,7 @@ class AdvisoryAgent(BaseAgent):
     Uses actual tenant data to provide specific, actionable strategic advice
     """
     
-    def generate_response(self, context: Dict[str, Any]) -> Dict[str, Any]:
+    async def generate_response(self, context: Dict[str, Any]) -> AgentResponse:
         """Generate strategic advice using enhanced tenant context"""
         
         query = context.get("original_query", "")
@@ -231,120 +672,107 @@ class AdvisoryAgent(BaseAgent):
         
         # Enhanced advisory prompt with intent detection
         prompt = self._build_enhanced_advisory_prompt(query, advisory_context)
-        
+        light = self._is_light_intent(query)
+
         try:
-            response_text = self._call_llm(
-                system_prompt="You are a strategic business advisor who provides actionable content strategy advice based on actual client data. Use specific numbers and patterns from their content library to give targeted recommendations.",
+            response_text = await self._call_llm(
+                system_prompt=self._advisory_system_prompt(advisory_context),
                 user_prompt=prompt,
                 temperature=0.4,  # Slightly higher for strategic creativity
-                max_tokens=500
+                max_tokens=150 if light else 500,
+                model=settings.OPENAI_LIGHT_MODEL if light else None
             )
             
-            return {
-                "response": response_text,
-                "suggested_questions": [ 
-                    "How can I optimize my content strategy?",
-                    "What strategic opportunities should I focus on?",
-                    "What should be my next content priority?"
-                ],
-                "confidence": "high"
-            }
+            return AgentResponse(
+                response=response_text,
+                suggested_questions=_ADVISORY_SUGGESTIONS,
+                confidence="high"
+            )
             
         except Exception as e:
             logger.error(f"Enhanced advisory agent error: {e}")
             return self._fallback_advisory_response(query, advisory_context)
-    
-    def _build_enhanced_advisory_prompt(self, query: str, advisory_context: Dict) -> str:
-        """Industry-standard strategic advisory prompt with intent classification"""
-        
-        total_content = advisory_context.get("total_content", 0)
-        categories = advisory_context.get("categories", {})
-        category_count = len(categories)
-        conversation_history = advisory_context.get("previous_context", [])
-        
-        # Format category data concisely
-        category_summary = ""
-        for cat_name, cat_values in categories.items():
-            if isinstance(cat_values, dict):
-                total_in_cat = sum(cat_values.values())
-                top_items = sorted(cat_values.items(), key=lambda x: x[1], reverse=True)[:3]
-                category_summary += f"{cat_name}: {total_in_cat} total (top: {', '.join([f'{k}({v})' for k, v in top_items])})\n"
-
-        # Build conversation context
-        context_string = ""
-        if conversation_history:
-            context_string = f"CONVERSATION CONTEXT: {conversation_history[-2:]}"
 
-        return f"""
-    ROLE: Strategic Content Business Advisor
-    TASK: Provide strategic guidance based on actual client content data
+    async def generate_response_stream(self, context: Dict[str, Any]):
+        """Stream the strategic advice as token chunks"""
+        query = context.get("original_query", "")
+        advisory_context = context.get("advisory_context", {})
+        prompt = self._build_enhanced_advisory_prompt(query, advisory_context)
+        light = self._is_light_intent(query)
+
+        try:
+            async for chunk in self._call_llm_stream(
+                self._advisory_system_prompt(advisory_context), prompt,
+                temperature=0.4,
+                max_tokens=150 if light else 500,
+                model=settings.OPENAI_LIGHT_MODEL if light else None
+            ):
+                yield chunk
+        except Exception as e:
+            logger.error(f"Advisory agent stream error: {e}")
+            yield self._fallback_advisory_response(query, advisory_context).response
 
-    CLIENT DATA PROFILE:
-    - Total Content Library: {total_content} pieces
-    - Content Categories: {category_count} active categories
-    - Category Breakdown:
-    {category_summary}
+    def get_suggested_questions(self, context: Dict[str, Any]) -> Sequence[str]:
+        """Suggestions for the streaming path"""
+        return _ADVISORY_SUGGESTIONS
 
-    QUERY: "{query}"
-    {context_string}
+    @staticmethod
+    def _is_light_intent(query: str) -> bool:
+        """Greeting/capability/overview turns a small model handles fine"""
+        return bool(
+            query and len(query) <= 120
+            and _LIGHT_INTENT_RE.search(query)
+            and not _HEAVY_INTENT_RE.search(query)
+        )
 
-    STRATEGIC ANALYSIS FRAMEWORK:
+    _BATCH_TEMPERATURE = 0.4
+    _BATCH_MAX_TOKENS = 500
 
-    1. INTENT CLASSIFICATION:
-    - GREETING/CAPABILITY: Simple introduction or capability questions
-    - OVERVIEW: "What do you know", "tell me about my content", "what do you do"
-    - SPECIFIC STRATEGIC: Focus on particular category/area
-    - COMPREHENSIVE: Full strategic analysis request
-    - OPTIMIZATION: "How to improve", "what should I prioritize"
+    def _batch_prompt(self, context: Dict[str, Any]) -> Dict[str, str]:
+        advisory_context = context.get("advisory_context", {})
+        return {
+            "system": self._advisory_system_prompt(advisory_context),
+            "user": self._build_enhanced_advisory_prompt(
+                context.get("original_query", ""), advisory_context
+            )
+        }
 
-    2. RESPONSE PROTOCOLS BY INTENT:
+    def _advisory_system_prompt(self, advisory_context: Dict) -> str:
+        """Static rules plus the semi-static client data profile
 
-    GREETING/CAPABILITY → Welcome + brief capability overview (50 words)
-    
-    OVERVIEW → Content library summary with key highlights (100-150 words):
-    - Total content scope
-    - 2-3 strongest categories
-    - 1-2 notable patterns or opportunities
-    
-    SPECIFIC STRATEGIC → Targeted analysis (150-200 words):
-    - Deep dive on requested category/area
-    - Specific recommendations with data support
-    - Next steps for that focus area
-    
-    COMPREHENSIVE → Full strategic assessment (250-300 words):
-    - Portfolio overview with strengths/gaps
-    - Priority recommendations ranked by impact
-    - Strategic roadmap suggestions
-    
-    OPTIMIZATION → Improvement-focused advice (200-250 words):
-    - Identify top 3 optimization opportunities
-    - Resource allocation recommendations
-    - Measurable next steps
-
-    3. DATA USAGE REQUIREMENTS:
-    - Reference specific numbers when making strategic points
-    - Compare categories to identify relative strengths
-    - Base all recommendations on actual content distribution
-    - Provide concrete, actionable advice
-
-    4. RESPONSE QUALITY STANDARDS:
-    - Start with direct response to user's specific question
-    - Use client's actual data to support all strategic points
-    - Provide actionable recommendations, not generic advice
-    - Maintain professional consulting tone
-    - Reference conversation history for coherent multi-turn dialogue
-
-    CONSTRAINTS:
-    - Only discuss content strategy and library optimization
-    - Base all advice on provided data, not assumptions
-    - For irrelevant queries: "This question isn't related to your content strategy. I can help you with content analysis or strategic planning. What would you like to focus on?"
-    - For insufficient context: Ask for clarification with 3-4 specific options
-
-    OUTPUT: Strategic advisory response following above protocols
-    """
+        The profile only changes when the tenant's content counts change, so
+        folding it into the system message keeps the whole system prompt
+        byte-identical across a tenant's turns - exactly the shape OpenAI's
+        automatic prefix caching rewards. Only the query and conversation
+        context stay in the (dynamic) user message.
+        """
+        total_content = advisory_context.get("total_content", 0)
+        categories = advisory_context.get("categories", {})
+
+        # Format category data concisely (cached per distinct distribution)
+        category_summary = _format_category_summary(tuple(
+            (cat_name, tuple(sorted(cat_values.items())))
+            for cat_name, cat_values in categories.items()
+            if isinstance(cat_values, dict)
+        ))
+
+        return _compose_advisory_system_prompt(
+            total_content, len(categories), category_summary
+        )
+
+    def _build_enhanced_advisory_prompt(self, query: str, advisory_context: Dict) -> str:
+        """Per-turn user prompt: just the query and conversation context"""
+        conversation_history = advisory_context.get("previous_context", [])
+
+        # Build conversation context (already capped to two turns upstream)
+        context_string = ""
+        if conversation_history:
+            context_string = f"\nCONVERSATION CONTEXT: {_stable_json(conversation_history)}"
+
+        return f'QUERY: "{query}"{context_string}'
 
         
-    def _fallback_advisory_response(self, query: str, advisory_context: Dict) -> Dict[str, Any]:
+    def _fallback_advisory_response(self, query: str, advisory_context: Dict) -> AgentResponse:
         """Enhanced fallback with basic tenant context"""
         total_content = advisory_context.get("total_content", 0)
         categories = advisory_context.get("content_maturity", 0)
@@ -354,13 +782,8 @@ class AdvisoryAgent(BaseAgent):
         else:
             response = "I can help you develop content strategy and provide strategic recommendations. What strategic challenge should we tackle first?"
         
-        return {
-            "response": response,
-            "suggested_questions": [
-                "How can I improve my content strategy?",
-                "What strategic opportunities should I focus on?",
-                "Help me plan my content roadmap",
-                "Where should I invest my content efforts?"
-            ],
-            "confidence": "medium"
-        }
\ No newline at end of file
+        return AgentResponse(
+            response=response,
+            suggested_questions=_ADVISORY_FALLBACK_SUGGESTIONS,
+            confidence="medium"
+        )
\ No newline at end of file
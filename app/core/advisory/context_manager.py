@@ -3,14 +3,65 @@
 Data Processor - Enhanced with rich tenant context for advisory
 """
 
-from typing import Dict, List, Any, Optional
+import heapq
+
+from typing import Dict, List, Any, Optional, Tuple
 from loguru import logger
 from collections import Counter
+from functools import lru_cache
 
 
 from ...models.query import QueryResult
 from ...models.database import DatabaseResponse
 from ...core.schema_extractor import get_schema_extractor
+from . import response_cache
+
+
+@lru_cache(maxsize=256)
+def _analyze_distribution_cached(
+    snapshot: Tuple[Tuple[Any, int], ...], total_items: int
+) -> Dict[str, Any]:
+    """Percentage/concentration/gap analysis for one (value, count) snapshot
+
+    Callers must treat the returned dict as read-only - it is shared across
+    cache hits.
+    """
+    def pct(count: int) -> float:
+        return round((count / total_items) * 100, 1)
+
+    # Only the top 5 ever reach the prompt, so select them in O(N) instead
+    # of sorting the whole distribution - a category like URL slugs can
+    # carry thousands of values
+    with_percentages = [
+        {"value": value, "count": count, "percentage": pct(count)}
+        for value, count in heapq.nlargest(5, snapshot, key=lambda x: x[1])
+    ]
+
+    # Determine concentration
+    top_percentage = with_percentages[0]["percentage"] if with_percentages else 0
+    if top_percentage > 70:
+        concentration = "highly_concentrated"
+    elif top_percentage > 40:
+        concentration = "moderately_concentrated"
+    else:
+        concentration = "evenly_distributed"
+
+    # Identify gaps (categories with 0 or very low content) - the three
+    # largest of the low-count values, matching what the old descending
+    # sort + slice selected
+    gaps = [
+        {"value": value, "count": count, "percentage": pct(count)}
+        for value, count in heapq.nlargest(
+            3, (pair for pair in snapshot if pair[1] <= 2), key=lambda x: x[1]
+        )
+    ]
+
+    return {
+        "concentration": concentration,
+        "top_category": with_percentages[0] if with_percentages else None,
+        "percentages": with_percentages,
+        "gaps": gaps
+    }
 
 
 class DataProcessor:
@@ -39,28 +90,63 @@ class DataProcessor:
         context = {
             "original_query": original_query,
             "operation": operation,
-            "response_type": self._determine_response_type(original_query, operation)
+            "response_type": self._determine_response_type(original_query, operation),
+            # Tenant + schema fingerprint for the semantic response cache:
+            # a paraphrase hit must never cross tenants or outlive a schema
+            # change, so the cache scopes entries to this value
+            "cache_guard": response_cache.make_key(tenant_id, operation, tenant_schema)
         }
         
-        # Add conversation context if available
+        # Add conversation context if available - capped upstream to the two
+        # turns the prompts actually use, then compacted to just the fields
+        # the LLM reads so the full session memory never inflates the prompt
         if session_id:
-            context["previous_context"] = session_handler.get_recent_context(session_id)
-        
+            context["previous_context"] = self._compact_previous_context(
+                session_handler.get_recent_context(session_id, limit=2)
+            )
+
         # Add actual data results based on operation (critical step)
         if operation in ["list", "semantic"]:
             context["data_results"] = self.format_content_results(db_response)
-            
+
         elif operation == "distribution":
             context["distribution_results"] = self.format_distribution_results(db_response)
-            
+
         else:  # pure_advisory - ENHANCED with rich tenant context
             context["advisory_context"] = self.format_advisory_context(
-                tenant_schema, 
+                tenant_schema,
                 tenant_id  # NEW: Pass tenant_id for rich samples
             )
-        
+            # The advisory prompt reads conversation history from its own
+            # context block
+            if "previous_context" in context:
+                context["advisory_context"]["previous_context"] = context["previous_context"]
+
         return context
-    
+
+    @staticmethod
+    def _compact_previous_context(
+        previous_context: List[Dict],
+        max_turns: int = 3,
+        max_chars_per_turn: int = 400
+    ) -> List[Dict]:
+        """Trim session turns to what the prompts actually use
+
+        Stored interactions carry timestamps, confidence, and the full
+        parsed_result (filters, routing) that only the query parser needs.
+        Serializing all of that into every prompt inflates input tokens for
+        no benefit, so the LLM gets just query/response/operation per turn,
+        with the response capped.
+        """
+        return [
+            {
+                "query": turn.get("query", ""),
+                "response": (turn.get("response_summary") or "")[:max_chars_per_turn],
+                "operation": turn.get("operation"),
+            }
+            for turn in previous_context[-max_turns:]
+        ]
+
     def format_advisory_context(self, tenant_schema: Dict, tenant_id: str) -> Dict[str, Any]:
         """SIMPLIFIED: Direct category data pass-through for advisory"""
         doc_counts = tenant_schema.get("document_counts", {})
@@ -94,17 +180,25 @@ class DataProcessor:
         
         content_insights = self._analyze_content_collection(db_response.data)
         
-        return {
+        results = {
             "status": "found_results",
             "total_found": total_count,
             "showing": showing_count,
             "has_more": total_count > showing_count,
-            "pagination": {
-                "page": db_response.page,
-                "total_pages": getattr(db_response, 'total_pages', None)
-            } if db_response.page else None,
             "content_insights": content_insights
         }
+
+        # Omit pagination entirely when absent - this dict is serialized
+        # straight into the prompt, and "pagination":null or a null
+        # total_pages is just wasted input tokens
+        if db_response.page:
+            pagination = {"page": db_response.page}
+            total_pages = getattr(db_response, 'total_pages', None)
+            if total_pages is not None:
+                pagination["total_pages"] = total_pages
+            results["pagination"] = pagination
+
+        return results
     
     def _analyze_content_collection(self, content_data: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
@@ -114,48 +208,72 @@ class DataProcessor:
         if not content_data:
             return {"analysis_available": False}
 
+        # The same result page produces the same insights, so fingerprint the
+        # collection by id + updatedAt (cheap, one pass) and reuse the counted
+        # breakdown within the cache TTL instead of re-walking every item.
+        # A re-synced document changes updatedAt and misses naturally.
+        fingerprint = response_cache.make_key(
+            "content_insights",
+            [(item.get("_id"), item.get("updatedAt")) for item in content_data]
+        )
+        cached = response_cache.get(fingerprint)
+        if cached is not None:
+            return cached
+
         insights = {"analysis_available": True}
 
         try:
             industries, audiences, page_types, funnel_stages = Counter(), Counter(), Counter(), Counter()
             geo_focuses, marketing_flags = Counter(), Counter()
 
+            # One dict lookup per category instead of an if/elif chain of
+            # string compares - this loop runs once per content item and a
+            # large tenant has tens of thousands of them
+            counters_by_slug = {
+                "industry": industries,
+                "primary_audience": audiences,
+                "page_type": page_types,
+                "funnel_stage": funnel_stages,
+            }
+
             for item in content_data:
                 # Custom category extraction
-                for cat in item.get("customCategory", []):
-                    slug = cat.get("slug")
-                    values = [attr["name"] for attr in cat.get("categoryAttribute", [])]
-
-                    if slug == "industry":
-                        industries.update(values)
-                    elif slug == "primary_audience":
-                        audiences.update(values)
-                    elif slug == "page_type":
-                        page_types.update(values)
-                    elif slug == "funnel_stage":
-                        funnel_stages.update(values)
-
-                # Marketing / Geo
-                if item.get("isMarketingContent") is not None:
-                    marketing_flags.update([
-                        "Marketing" if item["isMarketingContent"] else "Non-Marketing"
-                    ])
-                if item.get("geoFocus"):
-                    geo_focuses.update([item["geoFocus"]])
-
-            # Wrap everything under insights
-            insights["categories"] = {
+                for cat in item.get("customCategory", ()):
+                    counter = counters_by_slug.get(cat.get("slug"))
+                    if counter is not None:
+                        counter.update(
+                            attr["name"] for attr in cat.get("categoryAttribute", ())
+                        )
+
+                # Marketing / Geo - direct increments, no throwaway
+                # single-element lists
+                is_marketing = item.get("isMarketingContent")
+                if is_marketing is not None:
+                    marketing_flags["Marketing" if is_marketing else "Non-Marketing"] += 1
+                geo = item.get("geoFocus")
+                if geo:
+                    geo_focuses[geo] += 1
+
+            # Wrap everything under insights, skipping empty breakdowns -
+            # they serialize as "{}" in the prompt and tell the LLM nothing
+            categories = {
                 "industries": dict(industries),
                 "audiences": dict(audiences),
                 "pageTypes": dict(page_types),
                 "funnelStages": dict(funnel_stages),
             }
-            insights["geoFocuses"] = dict(geo_focuses)
-            insights["contentNature"] = dict(marketing_flags)
+            insights["categories"] = {k: v for k, v in categories.items() if v}
+            if geo_focuses:
+                insights["geoFocuses"] = dict(geo_focuses)
+            if marketing_flags:
+                insights["contentNature"] = dict(marketing_flags)
 
         except Exception as e:
             logger.warning(f"Content analysis failed: {e}")
             insights["analysis_error"] = "Partial analysis available"
+        else:
+            # Only complete analyses are worth replaying
+            response_cache.put(fingerprint, insights)
 
         logger.debug(f"Content analysis insights: {insights}")
         return insights
@@ -170,33 +288,51 @@ class DataProcessor:
                 "message": "No distribution data available"
             }
         
-        # Handle both single and multi-distribution formats
+        # Simple distribution list: db_response.data IS the single
+        # distribution. Handle it before the loop - the old per-item fallback
+        # re-summed the whole list and appended an identical entry for every
+        # row (N scans and N duplicates for N rows)
+        first = db_response.data[0]
+        if not hasattr(first, 'field') and not (isinstance(first, dict) and "field" in first):
+            distribution_data = db_response.data if isinstance(first, dict) else []
+            total_items = sum(d.get("count", 0) for d in distribution_data)
+            return {
+                "status": "has_distribution",
+                "distributions": [{
+                    "category": "Unknown Category",
+                    "total_items": total_items,
+                    "distribution": distribution_data,
+                    "analysis": self.analyze_distribution(distribution_data, total_items)
+                }],
+                "total_categories": 1
+            }
+
+        # Structured formats: one entry per field
         distributions = []
-        
+
         for item in db_response.data:
             if hasattr(item, 'field'):  # DistributionResult object
                 field_name = item.field
                 distribution_data = [{"value": d.value, "count": d.count} for d in item.distribution]
                 total_items = item.total_items
-            elif isinstance(item, dict) and "field" in item:  # Dict format
-                field_name = item["field"]
+            elif isinstance(item, dict):  # Dict format with "field"
+                field_name = item.get("field", "Unknown Category")
                 distribution_data = item.get("distribution", [])
                 total_items = item.get("total_items", 0)
-            else:  # Simple distribution list
-                field_name = "Unknown Category"
-                distribution_data = db_response.data if isinstance(db_response.data[0], dict) else []
-                total_items = sum(d.get("count", 0) for d in distribution_data)
-            
+            else:  # Unrecognized shape mixed into structured data
+                logger.debug(f"Skipping unrecognized distribution item: {type(item)}")
+                continue
+
             # Calculate percentages and find gaps
             analysis = self.analyze_distribution(distribution_data, total_items)
-            
+
             distributions.append({
                 "category": field_name,
                 "total_items": total_items,
                 "distribution": distribution_data,
                 "analysis": analysis
             })
-        
+
         return {
             "status": "has_distribution",
             "distributions": distributions,
@@ -205,43 +341,24 @@ class DataProcessor:
     
     def analyze_distribution(self, distribution_data: List[Dict], total_items: int) -> Dict[str, Any]:
         """
-        UNCHANGED: Calculate concrete percentages and identify gaps
+        Calculate concrete percentages and identify gaps
+        Memoized on a hashable snapshot - the same category distribution
+        shows up across consecutive requests, and re-sorting it each time
+        buys nothing
         """
         if not distribution_data or total_items == 0:
             return {"concentration": "no_data", "top_category": None, "gaps": []}
-        
-        # Sort by count to find top categories
-        sorted_dist = sorted(distribution_data, key=lambda x: x.get("count", 0), reverse=True)
-        
-        # Calculate percentages
-        with_percentages = []
-        for item in sorted_dist:
-            count = item.get("count", 0)
-            percentage = round((count / total_items) * 100, 1) if total_items > 0 else 0
-            with_percentages.append({
-                "value": item.get("value", "Unknown"),
-                "count": count,
-                "percentage": percentage
-            })
-        
-        # Determine concentration
-        top_percentage = with_percentages[0]["percentage"] if with_percentages else 0
-        if top_percentage > 70:
-            concentration = "highly_concentrated"
-        elif top_percentage > 40:
-            concentration = "moderately_concentrated"
-        else:
-            concentration = "evenly_distributed"
-        
-        # Identify gaps (categories with 0 or very low content)
-        gaps = [item for item in with_percentages if item["count"] <= 2]
-        
-        return {
-            "concentration": concentration,
-            "top_category": with_percentages[0] if with_percentages else None,
-            "percentages": with_percentages[:5],  # Top 5 only
-            "gaps": gaps[:3]  # Top 3 gaps only
-        }
+
+        snapshot = tuple(
+            (item.get("value", "Unknown"), item.get("count", 0))
+            for item in distribution_data
+        )
+        try:
+            return _analyze_distribution_cached(snapshot, total_items)
+        except TypeError:
+            # A list/dict value makes the snapshot unhashable - compute
+            # directly without memoizing rather than erroring out
+            return _analyze_distribution_cached.__wrapped__(snapshot, total_items)
     
     def _determine_response_type(self, query: str, operation: str) -> str:
         """
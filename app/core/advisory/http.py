@@ -0,0 +1,19 @@
+# app/core/advisory/http.py
+"""
+Shared HTTP client for OpenAI traffic
+One keep-alive pool, multiplexed over HTTP/2, used by every AsyncOpenAI
+client instead of the per-client default pool (10 keepalive connections)
+"""
+
+import httpx
+
+SHARED_HTTPX = httpx.AsyncClient(
+    http2=True,
+    timeout=httpx.Timeout(30.0, connect=5.0),
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+)
+
+
+async def close_shared_client() -> None:
+    """Close the shared pool - called from the app shutdown hook"""
+    await SHARED_HTTPX.aclose()
@@ -0,0 +1,46 @@
+# app/core/advisory/response_cache.py
+"""
+Content-addressed cache for LLM responses
+Identical prompts within the TTL return the stored completion instead of
+paying 1-3s of OpenAI latency (and cost) again
+"""
+
+import hashlib
+import threading
+from typing import Any, Optional
+
+import orjson
+from cachetools import TTLCache
+
+from ...config.setting import settings
+
+_cache: TTLCache = TTLCache(maxsize=2048, ttl=settings.ADVISORY_CACHE_TTL)
+_cache_lock = threading.Lock()
+
+
+def make_key(*parts: Any) -> str:
+    """Build a stable cache key from arbitrary parts
+
+    Non-JSON types (ObjectId, datetime) fall back to str() so Mongo
+    documents can be fingerprinted directly.
+    """
+    payload = orjson.dumps(parts, option=orjson.OPT_SORT_KEYS, default=str)
+    return hashlib.sha256(payload).hexdigest()
+
+
+def get(key: str) -> Optional[Any]:
+    """Return the cached value for key, or None"""
+    with _cache_lock:
+        return _cache.get(key)
+
+
+def put(key: str, value: Any) -> None:
+    """Store a value under key"""
+    with _cache_lock:
+        _cache[key] = value
+
+
+def clear() -> None:
+    """Drop all cached responses"""
+    with _cache_lock:
+        _cache.clear()
@@ -0,0 +1,131 @@
+# app/core/advisory/semantic_cache.py
+"""
+Embedding-based cache for near-duplicate queries
+Users phrase the same intent many ways ("show gaps", "where are my gaps",
+"content gaps?") - the exact-match response cache misses all of them. This
+cache embeds the query once and returns a stored response when cosine
+similarity clears the threshold, so paraphrases get cache-hit latency.
+
+Brute-force numpy search over a ring buffer: at 5k entries a single
+matrix-vector product is well under a millisecond, so a vector index
+library would be dead weight at this scale.
+"""
+
+import threading
+from typing import List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+from ...utilities.embeddings import embedding_generator
+
+# Cosine similarity required to treat two queries as the same intent.
+# 0.95 is deliberately strict - "marketing content" and "non-marketing
+# content" embed closer than you'd hope.
+_SIMILARITY_THRESHOLD = 0.95
+
+# Ring buffer capacity - oldest entries are overwritten first (FIFO)
+_MAX_ENTRIES = 5000
+
+_lock = threading.Lock()
+_vectors: Optional[np.ndarray] = None  # (capacity, dim), unit-normalized rows
+_guards: List[str] = []   # per-row tenant/schema fingerprint
+_responses: List[str] = []
+_write_pos = 0  # next ring-buffer slot to (over)write
+
+
+def _normalize_query(query: str) -> str:
+    """Collapse casing/whitespace so trivial variants embed identically"""
+    return " ".join(query.lower().split())
+
+
+def _embed(query: str) -> Optional[np.ndarray]:
+    """Unit-normalized embedding of the query, or None on API failure"""
+    try:
+        vector = np.asarray(
+            embedding_generator.generate_embedding(_normalize_query(query)),
+            dtype=np.float32
+        )
+    except Exception as e:
+        # Cache miss is the worst outcome of an embedding failure - never
+        # let it break the request
+        logger.warning(f"Semantic cache embedding failed: {e}")
+        return None
+
+    norm = np.linalg.norm(vector)
+    if norm == 0.0:
+        return None
+    return vector / norm
+
+
+def lookup(query: str, guard: str) -> Tuple[Optional[str], Optional[np.ndarray]]:
+    """
+    Look up a semantically equivalent cached response
+
+    Returns (response, query_vector). response is None on a miss; the vector
+    is returned either way so the caller can pass it back to store() without
+    paying for a second embedding call.
+    """
+    if not query:
+        return None, None
+
+    vector = _embed(query)
+    if vector is None:
+        return None, None
+
+    with _lock:
+        count = len(_responses)
+        if count == 0:
+            return None, vector
+
+        # Unit vectors, so the dot product IS the cosine similarity
+        similarities = _vectors[:count] @ vector
+        # Only rows from the same tenant + schema version are eligible -
+        # a paraphrase hit must never cross tenants or survive a schema change
+        eligible = np.fromiter(
+            (g == guard for g in _guards), dtype=bool, count=count
+        )
+        similarities = np.where(eligible, similarities, -1.0)
+
+        best = int(np.argmax(similarities))
+        score = float(similarities[best])
+        if score >= _SIMILARITY_THRESHOLD:
+            logger.debug(f"Semantic cache hit (similarity {score:.3f})")
+            return _responses[best], vector
+
+    return None, vector
+
+
+def store(vector: np.ndarray, guard: str, response: str) -> None:
+    """Store a response under an already-computed query vector"""
+    global _vectors, _write_pos
+
+    if vector is None or not response:
+        return
+
+    with _lock:
+        if _vectors is None:
+            _vectors = np.zeros(
+                (_MAX_ENTRIES, vector.shape[0]), dtype=np.float32
+            )
+
+        _vectors[_write_pos] = vector
+        if _write_pos < len(_responses):
+            # Ring buffer is full - overwrite the oldest entry
+            _guards[_write_pos] = guard
+            _responses[_write_pos] = response
+        else:
+            _guards.append(guard)
+            _responses.append(response)
+        _write_pos = (_write_pos + 1) % _MAX_ENTRIES
+
+
+def clear() -> None:
+    """Drop all cached entries"""
+    global _vectors, _write_pos
+
+    with _lock:
+        _vectors = None
+        _guards.clear()
+        _responses.clear()
+        _write_pos = 0
@@ -0,0 +1,90 @@
+# app/core/schema_cache.py
+"""
+In-process TTL cache for tenant schemas
+Avoids a full MongoDB round-trip on every list/semantic chat request
+"""
+
+import asyncio
+from typing import Dict, Any, Optional
+from cachetools import TTLCache
+from loguru import logger
+
+from .schema_extractor import get_tenant_schema
+from ..config.setting import settings
+
+# Cached schemas keyed by tenant_id. A cached None means the last fetch
+# failed recently (negative cache) so the warning path stays cheap.
+_schema_cache: TTLCache = TTLCache(maxsize=1024, ttl=300)
+
+# Per-tenant locks to prevent thundering-herd on cache misses
+_tenant_locks: Dict[str, asyncio.Lock] = {}
+
+
+def _get_tenant_lock(tenant_id: str) -> asyncio.Lock:
+    """Get (or lazily create) the lock for a tenant"""
+    lock = _tenant_locks.get(tenant_id)
+    if lock is None:
+        lock = _tenant_locks.setdefault(tenant_id, asyncio.Lock())
+    return lock
+
+
+async def get_cached_tenant_schema(tenant_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Get tenant schema, serving repeated requests from the in-process cache
+
+    Args:
+        tenant_id: Tenant ID
+
+    Returns:
+        Tenant schema dictionary, or None if the fetch recently failed
+    """
+    if tenant_id in _schema_cache:
+        logger.debug(f"Schema cache hit for tenant {tenant_id}")
+        return _schema_cache[tenant_id]
+
+    async with _get_tenant_lock(tenant_id):
+        # Another request may have populated the cache while we waited
+        if tenant_id in _schema_cache:
+            return _schema_cache[tenant_id]
+
+        try:
+            # get_tenant_schema is a blocking pymongo call - run it in a
+            # worker thread so the event loop keeps serving other requests.
+            # Cache hits above never pay the thread hop.
+            schema = await asyncio.to_thread(
+                get_tenant_schema,
+                settings.MONGODB_URI,
+                settings.DATABASE_NAME,
+                tenant_id
+            )
+        except Exception as e:
+            logger.warning(f"Failed to get tenant schema for {tenant_id}: {e}")
+            schema = None  # Negative cache so failing tenants stay cheap
+
+        _schema_cache[tenant_id] = schema
+        return schema
+
+
+def invalidate_tenant_schema(tenant_id: Optional[str] = None):
+    """
+    Invalidate cached schema after a tenant-schema mutation
+
+    Args:
+        tenant_id: Specific tenant to invalidate, or None for all
+    """
+    if tenant_id:
+        _schema_cache.pop(tenant_id, None)
+        logger.info(f"Invalidated schema cache for tenant {tenant_id}")
+    else:
+        _schema_cache.clear()
+        logger.info("Invalidated all schema cache entries")
+
+
+def get_cache_info() -> Dict[str, Any]:
+    """Get cache statistics"""
+    return {
+        "cached_tenants": list(_schema_cache.keys()),
+        "cache_size": len(_schema_cache),
+        "max_size": _schema_cache.maxsize,
+        "cache_ttl": _schema_cache.ttl
+    }
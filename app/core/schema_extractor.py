@@ -1,5 +1,6 @@
 # app/core/schema_extractor.py
-from pymongo import MongoClient
+# All Mongo access goes through the db_connection singleton - never build
+# ad-hoc MongoClient instances here (connection-pool blowup under load)
 from bson import ObjectId
 from typing import Dict, List, Any, Optional
 import logging
@@ -65,11 +66,11 @@ class SchemaExtractor:
     def _extract_categories(self, db, tenant_obj_id: ObjectId) -> Dict[str, List[str]]:
         """Extract all categories and their values for a tenant WITH USAGE COUNTS"""
         categories_data = {}
-        
+
         try:
             # DEBUG: Log the tenant_obj_id being used
             logger.debug(f"Extracting categories for tenant_obj_id: {tenant_obj_id} (type: {type(tenant_obj_id)})")
-            
+
             # FIRST: Check what format tenant is stored in the database
             sample_sitemap = db.sitemaps.find_one({"tenant": tenant_obj_id})
             if not sample_sitemap:
@@ -81,20 +82,13 @@ class SchemaExtractor:
                 else:
                     logger.warning(f"No sitemaps found for tenant {tenant_obj_id} in either ObjectId or string format")
                     return {}
-            
+
             logger.debug(f"Sample sitemap found: {sample_sitemap.get('_id') if sample_sitemap else 'None'}")
-            
-            # Count documents that will be processed
-            sitemap_count = db.sitemaps.count_documents({"tenant": tenant_obj_id})
-            logger.debug(f"Found {sitemap_count} sitemaps to process")
-            
-            if sitemap_count == 0:
-                logger.warning("No sitemaps found, categories will be empty")
-                return {}
+
             # Get all categories for this tenant
-            categories = {str(cat["_id"]): cat["name"] 
+            categories = {str(cat["_id"]): cat["name"]
                          for cat in db.categories.find({"tenant": tenant_obj_id})}
-            
+
             # Get category attributes mapping
             category_attrs = {}
             for attr in db["category-attributes"].find({"tenant": tenant_obj_id}):
@@ -105,92 +99,83 @@ class SchemaExtractor:
                         "category_name": category_name,
                         "attribute_name": attr["name"]
                     }
-            
-            # UPDATED: Count usage while extracting values from sitemaps
-            for doc in db.sitemaps.find({"tenant": tenant_obj_id}):
-                # Category attributes
-                attr_ids = doc.get("categoryAttribute", [])
-                for attr_id in attr_ids:
-                    attr_info = category_attrs.get(str(attr_id))
-                    if attr_info:
-                        cat_name = attr_info["category_name"]
-                        attr_name = attr_info["attribute_name"]
-                        
-                        if cat_name not in categories_data:
-                            categories_data[cat_name] = {}  # CHANGED: Dict instead of set
-                        
-                        if attr_name not in categories_data[cat_name]:
-                            categories_data[cat_name][attr_name] = 0  # CHANGED: Initialize count
-                        
-                        categories_data[cat_name][attr_name] += 1  # CHANGED: Increment count
-                
-                # Language (geoFocus) with counts
-                geo_focus = doc.get("geoFocus")
-                if geo_focus:
-                    if "Language" not in categories_data:
-                        categories_data["Language"] = {}  # CHANGED: Dict instead of set
-                    
-                    if geo_focus not in categories_data["Language"]:
-                        categories_data["Language"][geo_focus] = 0  # CHANGED: Initialize count
-                    
-                    categories_data["Language"][geo_focus] += 1  # CHANGED: Increment count
-            
-            # UPDATED: Content Types with counts
-            content_types_cursor = db["content-types"].find({"tenant": tenant_obj_id})
-            content_types_list = list(content_types_cursor)
-            if content_types_list:
-                categories_data["Content Type"] = {}
-                for ct in content_types_list:
-                    if ct.get("name"):
-                        ct_name = ct["name"]
-                        # Count how many sitemaps use this content type
-                        count = db.sitemaps.count_documents({
-                            "tenant": tenant_obj_id,
-                            "contentType": ct["_id"]
-                        })
-                        if count > 0:  # Only include if used
-                            categories_data["Content Type"][ct_name] = count
-            
-            # UPDATED: Topics with counts
-            topics_cursor = db["topics"].find({"tenant": tenant_obj_id})
-            topics_list = list(topics_cursor)
-            if topics_list:
-                categories_data["Topics"] = {}
-                for topic in topics_list:
-                    if topic.get("name"):
-                        topic_name = topic["name"]
-                        # Count how many sitemaps use this topic
-                        count = db.sitemaps.count_documents({
-                            "tenant": tenant_obj_id,
-                            "topic": topic["_id"]
-                        })
-                        if count > 0:  # Only include if used
-                            categories_data["Topics"][topic_name] = count
-            
-            # UPDATED: Custom Tags with counts
-            custom_tags_cursor = db["custom-tags"].find({"tenant": tenant_obj_id})
-            custom_tags_list = list(custom_tags_cursor)
-            if custom_tags_list:
-                categories_data["Custom Tags"] = {}
-                for tag in custom_tags_list:
-                    if tag.get("name"):
-                        tag_name = tag["name"]
-                        # Count how many sitemaps use this custom tag
-                        count = db.sitemaps.count_documents({
-                            "tenant": tenant_obj_id,
-                            "tag": tag["_id"]
-                        })
-                        if count > 0:  # Only include if used
-                            categories_data["Custom Tags"][tag_name] = count
-            
-            # CHANGED: Return dict with counts instead of list, only categories with content
+
+            # Single $facet aggregation replaces the per-document Python loop
+            # and the per-value count_documents calls (one round-trip total)
+            facet_pipeline = [
+                {"$match": {"tenant": tenant_obj_id}},
+                {"$facet": {
+                    "category_attributes": [
+                        {"$unwind": "$categoryAttribute"},
+                        {"$group": {"_id": "$categoryAttribute", "count": {"$sum": 1}}}
+                    ],
+                    "languages": [
+                        {"$match": {"geoFocus": {"$nin": [None, ""]}}},
+                        {"$group": {"_id": "$geoFocus", "count": {"$sum": 1}}}
+                    ],
+                    "content_types": [
+                        {"$match": {"contentType": {"$ne": None}}},
+                        {"$group": {"_id": "$contentType", "count": {"$sum": 1}}}
+                    ],
+                    "topics": [
+                        {"$match": {"topic": {"$ne": None}}},
+                        {"$group": {"_id": "$topic", "count": {"$sum": 1}}}
+                    ],
+                    "tags": [
+                        {"$unwind": "$tag"},
+                        {"$group": {"_id": "$tag", "count": {"$sum": 1}}}
+                    ]
+                }}
+            ]
+
+            facet_results = list(db.sitemaps.aggregate(facet_pipeline))
+            facets = facet_results[0] if facet_results else {}
+
+            # Category attributes grouped under their parent category name
+            for row in facets.get("category_attributes", []):
+                attr_info = category_attrs.get(str(row["_id"]))
+                if attr_info:
+                    cat_name = attr_info["category_name"]
+                    attr_name = attr_info["attribute_name"]
+                    categories_data.setdefault(cat_name, {})
+                    categories_data[cat_name][attr_name] = (
+                        categories_data[cat_name].get(attr_name, 0) + row["count"]
+                    )
+
+            # Language (geoFocus) with counts
+            languages = {row["_id"]: row["count"] for row in facets.get("languages", [])}
+            if languages:
+                categories_data["Language"] = languages
+
+            # Content Types / Topics / Custom Tags: map grouped ids to names
+            reference_facets = [
+                ("Content Type", "content-types", "content_types"),
+                ("Topics", "topics", "topics"),
+                ("Custom Tags", "custom-tags", "tags")
+            ]
+            for category_name, collection_name, facet_key in reference_facets:
+                names_by_id = {item["_id"]: item["name"]
+                              for item in db[collection_name].find({"tenant": tenant_obj_id})
+                              if item.get("name")}
+                if not names_by_id:
+                    continue
+
+                counts = {}
+                for row in facets.get(facet_key, []):
+                    name = names_by_id.get(row["_id"])
+                    if name:
+                        counts[name] = counts.get(name, 0) + row["count"]
+
+                categories_data[category_name] = counts
+
+            # Return dict with counts, only categories that have content
             result = {}
             for k, v in categories_data.items():
                 if len(v) > 0:  # Only include categories that have content
-                    result[k] = v  # v is now a dict with counts
-            
+                    result[k] = v  # v is a dict with counts
+
             return result
-            
+
         except Exception as e:
             logger.error(f"Error extracting categories with counts: {e}")
             return {}
@@ -303,6 +288,8 @@ def get_schema_extractor() -> SchemaExtractor:
 def get_tenant_schema(mongo_uri: str, db_name: str, tenant_id: str) -> Dict[str, Any]:
     """
     Backward compatibility function - extract tenant schema
+
+    The uri/db_name arguments are ignored; extraction always runs through
+    the shared db_connection singleton
     """
-    extractor = SchemaExtractor(mongo_uri, db_name)
-    return extractor.extract_tenant_schema(tenant_id)
\ No newline at end of file
+    return get_schema_extractor().extract_tenant_schema(tenant_id)
\ No newline at end of file
@@ -7,7 +7,6 @@ Only the store_interaction method needs updating
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 from loguru import logger
-from pymongo import MongoClient
 from bson import ObjectId
 
 from ..models.session import SessionInfo, InteractionRecord
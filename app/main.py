@@ -1,12 +1,16 @@
 # app/main.py
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 from loguru import logger
 
 from .config.setting import settings, validate_settings
 from .config.database import db_connection, vector_db_connection  # ✅ ADD
+from .core.advisory.http import close_shared_client
 from .api.routes import health, chat, sync  # ✅ ADD sync
+from .middleware.jwt import jwt_middleware
+from .middleware.body_limit import BodySizeLimitMiddleware
 from .utilities.logger import setup_logger
 from .config.logging_config import setup_logging
 from .services.vector_service import vector_service  # ✅ ADD
@@ -31,10 +35,21 @@ async def lifespan(app: FastAPI):
         logger.error(f"Configuration error: {e}")
         raise
     
+    # Warm JWT decode path so the first authenticated request doesn't stall
+    jwt_middleware.warm_up()
+
     # Connect to MongoDB
     if not db_connection.connect():
         logger.error("Failed to connect to MongoDB")
         raise HTTPException(status_code=500, detail="Database connection failed")
+
+    # Log server-side connection count - a spike here means something is
+    # building ad-hoc MongoClients instead of using the singleton
+    try:
+        connections = db_connection.get_client().admin.command("serverStatus")["connections"]
+        logger.info(f"MongoDB server connections: current={connections.get('current')}, available={connections.get('available')}")
+    except Exception as e:
+        logger.debug(f"Could not read serverStatus connections: {e}")
     
     # ✅ Connect to PostgreSQL (pgvector)
     if settings.VECTOR_SEARCH_ENABLED:
@@ -64,6 +79,10 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down Content Intelligence API...")
+    # Let background interaction writes finish so no session history is lost
+    from .services.chat_service import chat_service
+    await chat_service.flush_pending_storage()
+    await close_shared_client()
     db_connection.disconnect()
     
     # ✅ Disconnect from PostgreSQL
@@ -79,7 +98,18 @@ app = FastAPI(
     description=settings.API_DESCRIPTION,
     version=settings.API_VERSION,
     debug=settings.DEBUG,
-    lifespan=lifespan
+    lifespan=lifespan,
+    # orjson for every route that returns a plain dict (health, sync, debug)
+    default_response_class=ORJSONResponse
+)
+
+# Reject oversized bodies before deserialization - chat routes only.
+# Sync webhooks carry full sitemap payloads (the embedding generator
+# accepts up to 32k chars per document) and must not be capped here.
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    max_content_size=8192,
+    path_prefixes=("/api/v1/tenant",)
 )
 
 # Add CORS middleware
@@ -0,0 +1,58 @@
+# app/middleware/body_limit.py
+"""
+Reject oversized request bodies at the ASGI layer
+Stops abuse payloads before any JSON deserialization or Pydantic parsing
+"""
+
+import orjson
+
+
+class BodySizeLimitMiddleware:
+    """
+    Pure ASGI middleware that rejects requests whose Content-Length exceeds
+    the limit with a 413 before the body is read
+
+    Field-level max_length on MessageRequest still caps the message itself;
+    this guard only exists so multi-megabyte bodies never reach the parser.
+    When path_prefixes is given, only matching paths are capped - sync
+    webhooks legitimately carry large sitemap payloads.
+    """
+
+    def __init__(self, app, max_content_size: int = 8192,
+                 path_prefixes: tuple = ()):
+        self.app = app
+        self.max_content_size = max_content_size
+        self.path_prefixes = tuple(path_prefixes)
+        self._response_body = orjson.dumps({
+            "success": False,
+            "error": "Request body too large",
+            "operation": "validation_error"
+        })
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and self._applies_to(scope.get("path", "")):
+            for name, value in scope.get("headers", []):
+                if name == b"content-length":
+                    try:
+                        too_large = int(value) > self.max_content_size
+                    except ValueError:
+                        too_large = False
+                    if too_large:
+                        await send({
+                            "type": "http.response.start",
+                            "status": 413,
+                            "headers": [(b"content-type", b"application/json")]
+                        })
+                        await send({
+                            "type": "http.response.body",
+                            "body": self._response_body
+                        })
+                        return
+                    break
+
+        await self.app(scope, receive, send)
+
+    def _applies_to(self, path: str) -> bool:
+        if not self.path_prefixes:
+            return True
+        return path.startswith(self.path_prefixes)
@@ -1,15 +1,24 @@
 # app/core/middleware/jwt_middleware.py
+import hashlib
+import threading
+
 from fastapi import Request, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Optional
 from jose import jwt as jose_jwt, JWTError as JoseJWTError
+from cachetools import TTLCache
 import pydantic
-from loguru import logger 
+from loguru import logger
 
 from app.config.setting import settings
 
 security = HTTPBearer()
 
+# Verified-token cache keyed by sha256 of the raw token - repeated requests
+# within the TTL skip signature verification entirely
+_jwt_cache: TTLCache = TTLCache(maxsize=10_000, ttl=settings.JWT_CACHE_TTL)
+_jwt_cache_lock = threading.Lock()
+
 
 class JWTAccount(pydantic.BaseModel):
     user_id: str
@@ -19,6 +28,26 @@ class JWTMiddleware:
     def __init__(self, secret_key: str):
         self.secret_key = secret_key
     
+    def warm_up(self):
+        """
+        Prime the decode path at startup
+
+        HS256 with a static secret has no JWKS to fetch, but the first
+        decode still pays for jose's lazy backend imports and HMAC setup.
+        One encode/decode round-trip at startup moves that cost off the
+        first authenticated request.
+        """
+        try:
+            token = jose_jwt.encode(
+                {"user_id": "warmup", "tenant_id": "warmup"},
+                self.secret_key,
+                algorithm=settings.JWT_ALGORITHM
+            )
+            self.retrieve_details_from_token(token)
+            logger.info("JWT decode path warmed up")
+        except Exception as e:
+            logger.warning(f"JWT warm-up failed: {e}")
+
     def retrieve_details_from_token(self, token: str) -> JWTAccount:
         """
         Decode JWT token and extract user details
@@ -67,6 +96,12 @@ class JWTMiddleware:
         Raises:
             HTTPException: If token is missing or invalid
         """
+        # Reuse the account decoded earlier in this request (middleware or
+        # another dependency) - skips a second signature verification
+        cached_account = getattr(request.state, "jwt_account", None)
+        if cached_account is not None:
+            return cached_account
+
         try:
             # Get Authorization header
             authorization = request.headers.get("Authorization")
@@ -86,11 +121,23 @@ class JWTMiddleware:
                 )
             
             token = authorization.split("Bearer ")[1]
-            
+
+            # Serve recently verified tokens from the cache (no crypto)
+            token_hash = hashlib.sha256(token.encode()).digest()
+            with _jwt_cache_lock:
+                cached = _jwt_cache.get(token_hash)
+            if cached is not None:
+                request.state.jwt_account = cached
+                return cached
+
             # Decode and validate token
             jwt_account = self.retrieve_details_from_token(token)
+            with _jwt_cache_lock:
+                _jwt_cache[token_hash] = jwt_account
             
-            logger.info(f"JWT verified for user: {jwt_account.user_id}, tenant: {jwt_account.tenant_id}")
+            logger.debug("JWT verified for user: {}, tenant: {}",
+                         jwt_account.user_id, jwt_account.tenant_id)
+            request.state.jwt_account = jwt_account
             return jwt_account
             
         except ValueError as e:
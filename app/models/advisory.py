@@ -1,8 +1,25 @@
 # app/models/advisory.py
+from dataclasses import dataclass, asdict
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 
+
+@dataclass(slots=True)
+class AgentResponse:
+    """
+    Lightweight agent-layer response
+    Slots dataclass instead of a fresh dict per call: no per-instance dict,
+    faster attribute access, and orjson serializes it directly
+    """
+    response: str
+    suggested_questions: Tuple[str, ...] = ()
+    confidence: str = "medium"
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Dict view for boundaries that expect one (session storage)"""
+        return asdict(self)
+
 # class AdvisoryResponse(BaseModel):
 #     """
 #     Standard advisory response model
@@ -6,7 +6,9 @@ from .database import DatabaseResponse
 
 class MessageRequest(BaseModel):
     """Request model for chat message - only contains message and optional session_id"""
-    message: str
+    # Length enforced at parse time so oversized input is rejected before
+    # any dependency (JWT decode, Mongo validation) runs
+    message: str = Field(..., min_length=1, max_length=1000)
     session_id: Optional[str] = None
 
 class ChatRequest(BaseModel):
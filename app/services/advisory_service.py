@@ -9,7 +9,7 @@ from datetime import datetime
 from loguru import logger
 
 # Import new simple orchestrator
-from ..core.advisory.advisor_manager import AdvisoryOrchestrator
+from ..core.advisory.advisor_manager import get_advisory_orchestrator
 from ..models.query import QueryResult
 from ..models.database import DatabaseResponse
 from ..models.session import SessionInfo, InteractionRecord
@@ -29,7 +29,8 @@ class AdvisoryService:
     
     def __init__(self):
         # Replace LangChain with Simple Orchestrator for better performance
-        self.advisor = AdvisoryOrchestrator()
+        # Shared instance: same OpenAI client and session handler as chat
+        self.advisor = get_advisory_orchestrator()
         
     async def generate_advisory(
         self,
@@ -56,7 +57,7 @@ class AdvisoryService:
         """
         try:
             # Use simple orchestrator (direct routing, single API call)
-            response_dict = self.advisor.generate_response(
+            agent_response = await self.advisor.generate_response(
                 operation=operation,
                 query_result=query_result,
                 db_response=db_response,
@@ -64,12 +65,12 @@ class AdvisoryService:
                 original_query=original_query,
                 session_id=session_id
             )
-            
-            # Convert dict response to ChatResponse model (same as before)
+
+            # Convert agent response to ChatResponse model (same as before)
             advisory_response = ChatResponse(
-                response=response_dict.get("response", ""),
-                suggested_questions=response_dict.get("suggested_questions", []),
-                confidence=response_dict.get("confidence", ConfidenceLevel.MEDIUM),
+                response=agent_response.response,
+                suggested_questions=agent_response.suggested_questions,
+                confidence=agent_response.confidence,
                 operation=operation,
                 session_id=session_id
             )
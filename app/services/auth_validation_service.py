@@ -1,15 +1,105 @@
 # app/services/auth_validation_service.py
+import asyncio
 from typing import Optional
 from fastapi import HTTPException
 from bson import ObjectId
+from cachetools import TTLCache
 from loguru import logger
 
 from ..config.database import db_connection
 
+# Short-lived caches so repeat requests in the same session skip Mongo.
+# Only successful validations are cached - failures always re-validate.
+_access_cache: TTLCache = TTLCache(maxsize=100_000, ttl=60)
+_content_cache: TTLCache = TTLCache(maxsize=100_000, ttl=60)
+_cache_lock = asyncio.Lock()
+
 
 class AuthValidationService:
     """Validates user and tenant relationships"""
-    
+
+    @staticmethod
+    async def validate_all(user_id: str, tenant_id: str) -> bool:
+        """
+        Single round-trip validation of user, tenant, relationship, and content
+
+        One aggregation on user-tenants with $lookups replaces the three
+        find_one calls plus the sitemap count on the happy path. If the
+        fast path cannot validate, fall back to the step-by-step checks so
+        the client still gets the precise error.
+        """
+        cache_key = (user_id, tenant_id)
+        async with _cache_lock:
+            if cache_key in _access_cache and tenant_id in _content_cache:
+                logger.debug(f"Access cache hit for user {user_id} and tenant {tenant_id}")
+                return True
+
+        try:
+            db = db_connection.get_database()
+
+            pipeline = [
+                {"$match": {
+                    "user": ObjectId(user_id),
+                    "tenant": ObjectId(tenant_id)
+                }},
+                {"$lookup": {
+                    "from": "users",
+                    "localField": "user",
+                    "foreignField": "_id",
+                    "as": "user_doc"
+                }},
+                {"$lookup": {
+                    "from": "tenants",
+                    "localField": "tenant",
+                    "foreignField": "_id",
+                    "as": "tenant_doc"
+                }},
+                {"$lookup": {
+                    "from": "sitemaps",
+                    "let": {"t": "$tenant"},
+                    "pipeline": [
+                        {"$match": {"$expr": {"$eq": ["$tenant", "$$t"]}}},
+                        {"$limit": 1},
+                        {"$project": {"_id": 1}}
+                    ],
+                    "as": "content"
+                }},
+                {"$project": {
+                    "isActive": 1,
+                    "user_doc": {"$arrayElemAt": ["$user_doc", 0]},
+                    "tenant_doc": {"$arrayElemAt": ["$tenant_doc", 0]},
+                    "has_content": {"$gt": [{"$size": "$content"}, 0]}
+                }}
+            ]
+
+            result = list(db["user-tenants"].aggregate(pipeline))
+
+            if result:
+                doc = result[0]
+                user = doc.get("user_doc") or {}
+                tenant = doc.get("tenant_doc") or {}
+
+                if (doc.get("isActive", False)
+                        and user.get("isEmailVerified", False)
+                        and tenant.get("isActive", False)
+                        and tenant.get("isVerified", False)
+                        and doc.get("has_content", False)):
+                    async with _cache_lock:
+                        _access_cache[cache_key] = True
+                        _content_cache[tenant_id] = True
+                    return True
+
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Combined validation error: {e}")
+            raise HTTPException(500, "Failed to validate user access")
+
+        # Slow path: re-run the granular checks to raise the precise error
+        await AuthValidationService.validate_user_tenant_access(user_id, tenant_id)
+        await AuthValidationService.validate_tenant_has_content(tenant_id)
+        return True
+
     @staticmethod
     async def validate_user_tenant_access(user_id: str, tenant_id: str) -> bool:
         """
@@ -19,9 +109,15 @@ class AuthValidationService:
         3. User belongs to tenant
         4. UserTenant relationship is active
         """
+        cache_key = (user_id, tenant_id)
+        async with _cache_lock:
+            if cache_key in _access_cache:
+                logger.debug(f"Access cache hit for user {user_id} and tenant {tenant_id}")
+                return True
+
         try:
             db = db_connection.get_database()
-            
+
             # Step 1: Validate User
             user = db.users.find_one({"_id": ObjectId(user_id)})
             if not user:
@@ -61,6 +157,8 @@ class AuthValidationService:
                 raise HTTPException(403, "User access to tenant is inactive")
             
             logger.info(f"Validation passed for user {user_id} and tenant {tenant_id}")
+            async with _cache_lock:
+                _access_cache[cache_key] = True
             return True
             
         except HTTPException:
@@ -72,15 +170,21 @@ class AuthValidationService:
     @staticmethod
     async def validate_tenant_has_content(tenant_id: str) -> bool:
         """Validate tenant has sitemaps (content)"""
+        async with _cache_lock:
+            if tenant_id in _content_cache:
+                return True
+
         try:
             db = db_connection.get_database()
-            
+
             count = db.sitemaps.count_documents({"tenant": ObjectId(tenant_id)})
-            
+
             if count == 0:
                 logger.warning(f"Tenant {tenant_id} has no content")
-                raise HTTPException(404, "Tenant has no content")   
-            
+                raise HTTPException(404, "Tenant has no content")
+
+            async with _cache_lock:
+                _content_cache[tenant_id] = True
             return True
             
         except HTTPException:
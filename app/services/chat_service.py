@@ -4,19 +4,25 @@ OPTIONAL UPDATE: How to pass conversation context to parser
 You can implement this later when ready to enable context awareness
 """
 
+import asyncio
+
 from typing import Dict, Any, Optional, List
 from loguru import logger
 
 from ..core.query_parser import SmartQueryParser
 from ..core.query_builder import MongoQueryExecutor
-from ..core.advisory.advisor_manager import AdvisoryOrchestrator
+from ..core.advisory.advisor_manager import get_advisory_orchestrator
 from ..services.schema_service import schema_service
 from ..services.session_service import session_service
 from ..models.query import QueryResult
 from ..models.database import DatabaseResponse
+from ..models.advisory import AgentResponse
 from ..models.chat import ChatResponse, DataSummary
 from ..config.setting import settings
 
+# Operations that return content rows (vs distribution/advisory)
+_CONTENT_OPS = frozenset({"list", "semantic"})
+
 
 class ChatService:
     """
@@ -26,7 +32,10 @@ class ChatService:
     def __init__(self):
         self.query_parser = SmartQueryParser()
         self.query_executor = MongoQueryExecutor()
-        self.advisor = AdvisoryOrchestrator()
+        self.advisor = get_advisory_orchestrator()
+        # Strong references to in-flight background storage tasks so the
+        # event loop doesn't garbage-collect them mid-write
+        self._storage_tasks: set = set()
         
     async def process_chat_message(
         self,
@@ -38,44 +47,15 @@ class ChatService:
         Process complete chat pipeline with optional context awareness
         """
         try:
-            # OPTIONAL: Get conversation context for parser
-            conversation_history = None
-            if session_id:
-                conversation_history = await self._get_parsing_context(session_id)
-            
-            # Step 1: Parse query WITH CONTEXT (if available)
-            logger.info(f"Parsing query for tenant {tenant_id}: {message[:50]}...")
-            query_result = self.query_parser.parse(
-                message, 
-                tenant_id,
-                conversation_history  # NEW: Pass context to parser
+            # Steps 1-3: parse, fetch schema, execute query (shared with the
+            # streaming path)
+            query_result, tenant_schema, db_response = await self._prepare_query(
+                message, tenant_id, session_id
             )
-            logger.info(f"Parsed query result: {query_result}")
-            
-            # Log the generated description
-            if query_result.description:
-                logger.info(f"Query description: {query_result.description}")
-            
-            # Step 2: Get tenant schema (UNCHANGED)
-            logger.info("Fetching tenant schema")
-            tenant_schema = await schema_service.get_tenant_schema(tenant_id)
-            
-            # Step 3: Execute query if data needed (UNCHANGED)
-            if query_result.needs_data or query_result.operation != "pure_advisory":
-                logger.info(f"Executing {query_result.operation} query")
-                db_response = self.query_executor.execute_query_from_result(query_result)
-            else:
-                logger.info("Skipping database query for pure advisory")
-                db_response = DatabaseResponse(
-                    success=True,
-                    data={"message": "Advisory operation - no database query executed"},
-                    advisory_mode=True,
-                    operation=query_result.operation
-                )
-            
+
             # Step 4: Generate advisory response (UNCHANGED)
             logger.info("Generating advisory insights")
-            advisory_response_dict = self.advisor.generate_response(
+            advisory_response = await self.advisor.generate_response(
                 operation=query_result.operation,
                 query_result=query_result,
                 db_response=db_response,
@@ -86,28 +66,30 @@ class ChatService:
             )
             
             # Step 5: Store interaction WITH PARSED RESULT for future context
+            # Fire-and-forget: the Mongo write (~5-50ms) completes in the
+            # background instead of delaying the response
             if session_id:
-                await self._store_interaction_with_context(
+                self._store_interaction_background(
                     session_id=session_id,
                     tenant_id=tenant_id,
                     message=message,
-                    response=advisory_response_dict,
+                    response=advisory_response.as_dict(),
                     query_result=query_result  # NEW: Store parsed result
                 )
-            
+
             # Step 6: Create response (UNCHANGED)
             response = ChatResponse(
                 success=True,
-                response=advisory_response_dict["response"],
-                suggested_questions=advisory_response_dict["suggested_questions"],
-                confidence=advisory_response_dict["confidence"],
+                response=advisory_response.response,
+                suggested_questions=advisory_response.suggested_questions,
+                confidence=advisory_response.confidence,
                 operation=query_result.operation,
                 session_id=session_id,
                 data_summary=self._create_data_summary(db_response).dict(),
                 db_response=db_response
             )
             
-            logger.info(f"Chat processing completed")
+            logger.info("Chat processing completed")
             return response
             
         except Exception as e:
@@ -126,6 +108,123 @@ class ChatService:
                 session_id=session_id
             )
     
+    async def _prepare_query(
+        self,
+        message: str,
+        tenant_id: str,
+        session_id: Optional[str]
+    ):
+        """
+        Shared front half of the chat pipeline: parse the query (with session
+        context when available), fetch the tenant schema, and execute the
+        database query. Used by both the buffered and streaming paths.
+        """
+        # OPTIONAL: Get conversation context for parser
+        conversation_history = None
+        if session_id:
+            conversation_history = await self._get_parsing_context(session_id)
+
+        # Step 1: Parse query WITH CONTEXT (if available)
+        logger.info("Parsing query for tenant {}: {}...", tenant_id, message[:50])
+        query_result = self.query_parser.parse(
+            message,
+            tenant_id,
+            conversation_history  # NEW: Pass context to parser
+        )
+        # repr of the full result is expensive - only build it if INFO is emitted
+        logger.opt(lazy=True).info("Parsed query result: {}", lambda: query_result)
+
+        # Log the generated description
+        if query_result.description:
+            logger.info("Query description: {}", query_result.description)
+
+        # Step 2: Get tenant schema (UNCHANGED)
+        logger.info("Fetching tenant schema")
+        tenant_schema = await schema_service.get_tenant_schema(tenant_id)
+
+        # Step 3: Execute query if data needed (UNCHANGED)
+        if query_result.needs_data or query_result.operation != "pure_advisory":
+            logger.info("Executing {} query", query_result.operation)
+            # Blocking pymongo work - keep it off the event loop
+            db_response = await asyncio.to_thread(
+                self.query_executor.execute_query_from_result, query_result
+            )
+        else:
+            logger.info("Skipping database query for pure advisory")
+            db_response = DatabaseResponse(
+                success=True,
+                data={"message": "Advisory operation - no database query executed"},
+                advisory_mode=True,
+                operation=query_result.operation
+            )
+
+        return query_result, tenant_schema, db_response
+
+    async def process_chat_message_stream(
+        self,
+        message: str,
+        tenant_id: str,
+        session_id: Optional[str] = None
+    ):
+        """
+        Streaming variant of process_chat_message
+
+        Yields {"type": "token", "content": ...} events while the LLM
+        generates, then one {"type": "final", "response": ChatResponse} event
+        with the complete response for the caller to format. Interaction
+        storage happens after the stream finishes, exactly like the buffered
+        path. Exceptions propagate to the caller's stream error handling.
+        """
+        query_result, tenant_schema, db_response = await self._prepare_query(
+            message, tenant_id, session_id
+        )
+
+        logger.info("Streaming advisory insights")
+        chunks: List[str] = []
+        meta: Dict[str, Any] = {}
+        async for event in self.advisor.generate_response_stream(
+            operation=query_result.operation,
+            query_result=query_result,
+            db_response=db_response,
+            tenant_schema=tenant_schema,
+            original_query=message,
+            session_id=session_id,
+            tenant_id=tenant_id
+        ):
+            if event["type"] == "token":
+                chunks.append(event["content"])
+                yield event
+            else:
+                meta = event
+
+        advisory_response = AgentResponse(
+            response="".join(chunks).strip(),
+            suggested_questions=tuple(meta.get("suggested_questions", ())),
+            confidence=meta.get("confidence", "high")
+        )
+
+        if session_id:
+            self._store_interaction_background(
+                session_id=session_id,
+                tenant_id=tenant_id,
+                message=message,
+                response=advisory_response.as_dict(),
+                query_result=query_result
+            )
+
+        response = ChatResponse(
+            success=True,
+            response=advisory_response.response,
+            suggested_questions=advisory_response.suggested_questions,
+            confidence=advisory_response.confidence,
+            operation=query_result.operation,
+            session_id=session_id,
+            data_summary=self._create_data_summary(db_response).dict(),
+            db_response=db_response
+        )
+        logger.info("Chat stream completed")
+        yield {"type": "final", "response": response}
+
     async def _get_parsing_context(self, session_id: str) -> List[Dict]:
         """
         NEW METHOD: Get last 2 queries and their parsed results for context
@@ -164,6 +263,17 @@ class ChatService:
             logger.error(f"Failed to get parsing context: {e}")
             return None
     
+    def _store_interaction_background(self, **kwargs):
+        """Schedule interaction storage without blocking the response"""
+        task = asyncio.create_task(self._store_interaction_with_context(**kwargs))
+        self._storage_tasks.add(task)
+        task.add_done_callback(self._storage_tasks.discard)
+
+    async def flush_pending_storage(self):
+        """Await outstanding background writes (called on app shutdown)"""
+        if self._storage_tasks:
+            await asyncio.gather(*self._storage_tasks, return_exceptions=True)
+
     async def _store_interaction_with_context(
     self,
     session_id: str,
@@ -194,7 +304,9 @@ class ChatService:
             }
             
             # Store in session handler WITH parsed result
-            self.advisor.session_handler.store_interaction(
+            # Sync pymongo write - keep it off the event loop
+            await asyncio.to_thread(
+                self.advisor.session_handler.store_interaction,
                 session_id=session_id,
                 query=message,
                 response=response,
@@ -223,7 +335,7 @@ class ChatService:
                 message="No database query performed"
             )
         
-        if db_response.operation in ["list", "semantic"]:
+        if db_response.operation in _CONTENT_OPS:
             return DataSummary(
                 type="content_list",
                 count=len(db_response.data) if db_response.data else 0,
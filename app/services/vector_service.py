@@ -4,7 +4,7 @@ Vector search service using PostgreSQL + pgvector
 Synchronous implementation matching codebase pattern
 """
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 import json
 from loguru import logger
 
@@ -168,6 +168,45 @@ class VectorService:
             logger.error(f"Failed to store embedding: {e}")
             return False
     
+    def store_embeddings_batch(
+        self,
+        rows: List[Tuple[str, str, List[float]]]
+    ) -> int:
+        """
+        Store or update many embeddings in a single INSERT
+
+        Args:
+            rows: List of (sitemap_id, tenant_id, embedding) tuples
+
+        Returns:
+            Number of rows written (0 on failure)
+        """
+        if not rows:
+            return 0
+
+        values = [
+            (sitemap_id, tenant_id, '[' + ','.join(map(str, embedding)) + ']')
+            for sitemap_id, tenant_id, embedding in rows
+        ]
+
+        try:
+            stored = vector_db_connection.bulk_upsert("""
+                INSERT INTO sitemap_embeddings
+                    (sitemap_id, tenant_id, embedding, created_at, updated_at)
+                VALUES %s
+                ON CONFLICT (sitemap_id)
+                DO UPDATE SET
+                    embedding = EXCLUDED.embedding,
+                    updated_at = NOW()
+            """, values, template="(%s, %s, %s::vector, NOW(), NOW())")
+
+            logger.debug(f"Stored {stored} embeddings in one batch")
+            return stored
+
+        except Exception as e:
+            logger.error(f"Failed to store embeddings batch: {e}")
+            return 0
+
     def delete_embedding(self, sitemap_id: str, tenant_id: str) -> bool:
         """
         Delete embedding for a sitemap
@@ -5,16 +5,27 @@ Synchronous implementation to match codebase pattern
 """
 
 from typing import List, Optional
+
+import httpx
 from openai import OpenAI
 from loguru import logger
 
 from ..config.setting import settings
 
+# One keep-alive connection pool shared by all embedding calls. The backfill
+# fans out up to 16 concurrent batches through this client, so size the pool
+# explicitly instead of relying on library defaults.
+_http_client = httpx.Client(
+    limits=httpx.Limits(max_connections=64, max_keepalive_connections=64),
+    timeout=30.0
+)
+
+
 class EmbeddingGenerator:
     """Generate embeddings for text using OpenAI"""
-    
+
     def __init__(self, model: str = None):
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        self.client = OpenAI(api_key=settings.OPENAI_API_KEY, http_client=_http_client)
         self.model = model or settings.EMBEDDING_MODEL
         self.max_tokens = 8000  # OpenAI token limit
     
@@ -97,6 +108,46 @@ class EmbeddingGenerator:
             logger.error(f"Failed to generate embedding: {e}")
             raise
     
+    def generate_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generate embeddings for many texts in one OpenAI request
+
+        Args:
+            texts: Input texts (each truncated if too long)
+
+        Returns:
+            List of embedding vectors in the same order as texts
+
+        Raises:
+            Exception: If OpenAI API call fails
+        """
+        if not texts:
+            return []
+
+        max_chars = self.max_tokens * 4
+        cleaned = [
+            (text[:max_chars] if text and text.strip() else " ")
+            for text in texts
+        ]
+
+        try:
+            response = self.client.embeddings.create(
+                model=self.model,
+                input=cleaned
+            )
+
+            # Order by index - the API may not preserve input order
+            embeddings: List[List[float]] = [None] * len(cleaned)
+            for item in response.data:
+                embeddings[item.index] = item.embedding
+
+            logger.debug(f"Generated {len(embeddings)} embeddings in one request")
+            return embeddings
+
+        except Exception as e:
+            logger.error(f"Failed to generate embeddings batch: {e}")
+            raise
+
     def generate_embedding_for_sitemap(self, sitemap_data: dict) -> List[float]:
         """
         Generate embedding from sitemap document
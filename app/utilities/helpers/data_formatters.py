@@ -1,6 +1,27 @@
 # app/core/helpers/data_formatters.py
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Union
+
+import orjson
 from bson import ObjectId
+from fastapi import Response
+
+# Operations whose responses carry sitemap rows + column config
+_CONTENT_OPS = frozenset({"list", "semantic"})
+
+# Pre-encoded error templates for the fixed error kinds - the failure path
+# costs a single bytes.replace instead of a dict build + JSON encode
+_ERROR_MSG_SENTINEL = b"__MSG__"
+_ERROR_TEMPLATES: Dict[str, bytes] = {
+    operation: orjson.dumps({
+        "success": False,
+        "message": "__MSG__",
+        "data": {
+            "operation": operation,
+            "error": "__MSG__"
+        }
+    })
+    for operation in ("validation_error", "http_error", "internal_error")
+}
 
 
 def convert_objectids_to_strings(data):
@@ -153,9 +174,10 @@ def build_column_config(sitemaps_data: List[Dict]) -> List[Dict[str, Any]]:
 
 # Updated API response function to use the single column config method
 def format_api_response(
-    chat_response, 
-    tenant_schema: Dict = None, 
-    tenant_id: str = None
+    chat_response,
+    tenant_schema: Dict = None,
+    tenant_id: str = None,
+    session_id: str = None
 ) -> Dict[str, Any]:
     """Convert internal ChatResponse to clean API format with correct column config"""
     
@@ -166,7 +188,7 @@ def format_api_response(
     }
     
     # Handle different operations
-    if chat_response.operation in ['list', 'semantic']:
+    if chat_response.operation in _CONTENT_OPS:
         # Get sitemaps data
         sitemaps_data = []
         if hasattr(chat_response, 'db_response') and chat_response.db_response and hasattr(chat_response.db_response, 'data'):
@@ -186,9 +208,14 @@ def format_api_response(
                     api_response["data"][field] = value
     
     elif chat_response.operation == 'distribution':
-        # For distribution: include distribution data
+        # For distribution: include distribution data. The query builder
+        # returns DistributionResult pydantic models - dump them to plain
+        # dicts so orjson (no default= hook) can render the payload
         if hasattr(chat_response, 'db_response') and chat_response.db_response and hasattr(chat_response.db_response, 'data'):
-            api_response["data"]["distribution"] = chat_response.db_response.data or []
+            api_response["data"]["distribution"] = [
+                item.model_dump() if hasattr(item, "model_dump") else item
+                for item in chat_response.db_response.data or []
+            ]
         else:
             api_response["data"]["distribution"] = []
     
@@ -203,13 +230,25 @@ def format_api_response(
     api_response["data"]["confidence"] = getattr(chat_response, 'confidence', 'medium')
     api_response["data"]["suggested_questions"] = getattr(chat_response, 'suggested_questions', [])
     
-    if hasattr(chat_response, 'session_id') and chat_response.session_id:
+    # Caller-provided session_id wins (covers auto-created sessions)
+    if session_id:
+        api_response["data"]["session_id"] = session_id
+    elif hasattr(chat_response, 'session_id') and chat_response.session_id:
         api_response["data"]["session_id"] = chat_response.session_id
-    
+
     return api_response
 
-def format_error_response(error_message: str, operation: str = "unknown") -> Dict[str, Any]:
+def format_error_response(error_message: str, operation: str = "unknown") -> Union[Response, Dict[str, Any]]:
     """Format error response in API format"""
+    template = _ERROR_TEMPLATES.get(operation)
+    if template is not None:
+        # Splice the JSON-escaped message into the prebuilt template
+        escaped_msg = orjson.dumps(error_message)[1:-1]
+        return Response(
+            content=template.replace(_ERROR_MSG_SENTINEL, escaped_msg),
+            media_type="application/json"
+        )
+
     return {
         "success": False,
         "message": error_message,